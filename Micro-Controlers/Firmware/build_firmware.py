@@ -12,20 +12,157 @@ cd Micro-Controlers/Firmware
 python build_firmware.py
 """
 
+import argparse
+import io
+import os
+import hashlib
 import subprocess
 import sys
 import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from contextlib import redirect_stdout
 from pathlib import Path
 
+# Per-platform build fingerprints live here
+BUILD_CACHE = Path(".build_cache")
+
+# Resolved at import so spawned build workers see the same answer as the parent
+CCACHE = shutil.which("ccache")
+PIO_BIN = shutil.which("pio")
+
+# PlatformIO pre-script that routes the compilers through ccache. It looks
+# ccache up itself on every build, so an ini generated before ccache was
+# installed (or after it was removed) still does the right thing
+CCACHE_SCRIPT = """Import("env")
+import shutil
+if shutil.which("ccache"):
+    env.Replace(CC="ccache " + env.subst("$CC"), CXX="ccache " + env.subst("$CXX"))
+"""
+
+# Environment for every pio invocation. Each platform is its own project and
+# builds run side by side, so rather than folding them into one multi-env call
+# trim what every PlatformIO start pays for: telemetry and the progress bar.
+PIO_ENV = dict(
+    os.environ,
+    PLATFORMIO_SETTING_ENABLE_TELEMETRY="no",
+    PLATFORMIO_DISABLE_PROGRESSBAR="true",
+)
+
 def check_toolchain():
-    """Verify PlatformIO is installed"""
-    if not shutil.which("pio"):
+    """Verify PlatformIO is installed and return its full path"""
+    if not PIO_BIN:
         print("❌ PlatformIO not found!")
         print("Install: pip install platformio")
         sys.exit(1)
-    print("✅ PlatformIO found")
+    
+    # A binary on PATH can still be a broken install; make sure it actually runs
+    try:
+        res = subprocess.run([PIO_BIN, "--version"], capture_output=True, text=True,
+                             timeout=5, env=PIO_ENV)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        res = None
+        error = str(e)
+    if res is None or res.returncode != 0:
+        print(f"❌ PlatformIO at {PIO_BIN} is not working!")
+        print(error if res is None else (res.stderr or res.stdout).strip())
+        print("Reinstall: pip install -U platformio")
+        sys.exit(1)
+    
+    # "PlatformIO Core, version 6.1.11"
+    version = res.stdout.strip().rsplit(" ", 1)[-1]
+    print(f"✅ PlatformIO found (version {version})")
+    
+    if CCACHE:
+        print("✅ ccache found - compiler cache enabled")
+    else:
+        print("ℹ️  ccache not found - building without compiler cache")
+    
+    return PIO_BIN
 
-def build_platform(platform_dir: str, env_name: str):
+def source_file(platform: str) -> Path:
+    """Firmware source file for a platform"""
+    if platform == "nano":
+        return Path("../nano_firmware.ino")
+    return Path(f"../{platform}_firmware.cpp")
+
+def build_fingerprint(platform: str):
+    """SHA-256 of the platform source + platformio.ini, or None if either is missing"""
+    try:
+        src_bytes = source_file(platform).read_bytes()
+        ini_bytes = Path(f"{platform}/platformio.ini").read_bytes()
+    except OSError:
+        return None
+    return hashlib.sha256(src_bytes + ini_bytes).hexdigest()
+
+def read_stamp(platform: str):
+    """Return (fingerprint, published binary) from the last successful build"""
+    try:
+        digest, binary = (BUILD_CACHE / f"{platform}.stamp").read_text().splitlines()[:2]
+    except (OSError, ValueError):
+        return None, None
+    return digest, Path(binary)
+
+def write_stamp(platform: str, digest: str, binary: Path):
+    """Record a successful build; written via rename so a crash never leaves half a stamp"""
+    BUILD_CACHE.mkdir(exist_ok=True)
+    stamp = BUILD_CACHE / f"{platform}.stamp"
+    tmp = stamp.with_suffix(".tmp")
+    tmp.write_text(f"{digest}\n{binary}\n")
+    os.replace(tmp, stamp)
+
+def write_if_changed(path: Path, text: str):
+    """Write text to path only when it differs, so unchanged files keep their mtime"""
+    try:
+        if path.read_text() == text:
+            return
+    except OSError:
+        pass
+    path.write_text(text)
+
+def sync_source(platform: str):
+    """Refresh src/main.cpp from the platform source, leaving it untouched if identical"""
+    src = source_file(platform)
+    dst = Path(f"{platform}/src/main.cpp")
+    try:
+        if dst.read_bytes() == src.read_bytes():
+            return
+    except OSError:
+        pass
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    # Link first so the project always sees the latest bytes without a copy
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    try:
+        os.symlink(src.resolve(), dst)
+        return
+    except OSError:
+        pass
+    shutil.copy(src, dst)
+    # Carry the source's timestamps over so dependency tracking sees the real edit time
+    st = src.stat()
+    os.utime(dst, (st.st_atime, st.st_mtime))
+
+def link_or_copy(src: Path, dest: Path):
+    """Hardlink src to dest, copying instead when a link isn't possible (e.g. cross-device)"""
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+def tail_log(log_path: Path, lines: int = 40) -> str:
+    """Last few lines of a build log"""
+    with open(log_path, errors="replace") as f:
+        return "".join(deque(f, maxlen=lines))
+
+def build_platform(platform_dir: str, env_name: str, jobs: int = 1):
     """Build firmware for a specific platform"""
     print(f"\n{'='*50}")
     print(f"Building {platform_dir.upper()}...")
@@ -38,38 +175,55 @@ def build_platform(platform_dir: str, env_name: str):
         # Create platformio.ini if it doesn't exist
         if not (platform_path / "platformio.ini").exists():
             create_platformio_ini(platform_dir)
+        else:
+            # Keep the pre-script current for projects generated by older runs
+            write_if_changed(platform_path / "ccache.py", CCACHE_SCRIPT)
+        sync_source(platform_dir)
+        
+        # Skip the build entirely if nothing changed since the last success
+        digest = build_fingerprint(platform_dir)
+        cached_digest, cached_binary = read_stamp(platform_dir)
+        if digest and digest == cached_digest and cached_binary.exists():
+            print(f"⏭ {platform_dir.upper()} cached: {cached_binary}")
+            return True
         
-        # Run PlatformIO build
-        result = subprocess.run(
-            ["pio", "run", "-e", env_name],
-            cwd=platform_path,
-            capture_output=True,
-            text=True
-        )
+        # Run PlatformIO build, streaming its output straight to a per-platform
+        # log instead of buffering it in memory (builds run side by side)
+        BUILD_CACHE.mkdir(exist_ok=True)
+        log_path = BUILD_CACHE / f"{platform_dir}.log"
+        with open(log_path, "w") as log:
+            result = subprocess.run(
+                [PIO_BIN, "run", "-e", env_name, "-j", str(jobs)],
+                cwd=platform_path,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=PIO_ENV
+            )
         
         if result.returncode == 0:
             print(f"✅ {platform_dir.upper()} build successful!")
             
             # Copy binary to firmware root
-            binary = find_binary(platform_path, env_name)
+            binary = find_binary(platform_path, env_name, platform_dir)
             if binary:
                 dest = Path(f"../{platform_dir}_firmware{binary.suffix}")
-                shutil.copy2(binary, dest)
-                print(f"📦 Binary copied to: {dest}")
+                link_or_copy(binary, dest)
+                print(f"📦 Binary published to: {dest}")
+                if digest:
+                    write_stamp(platform_dir, digest, dest)
                 return True
         else:
-            print(f"❌ {platform_dir.upper()} build failed!")
-            print(result.stderr)
+            print(f"❌ {platform_dir.upper()} build failed! Full log: {log_path}")
+            print(tail_log(log_path))
             return False
             
     except Exception as e:
         print(f"❌ Error building {platform_dir}: {e}")
         return False
 
-def create_platformio_ini(platform: str):
-    """Create platformio.ini for each platform"""
-    configs = {
-        "esp32": """
+# platformio.ini template for each platform
+_PLATFORMIO_CONFIGS: dict[str, str] = {
+    "esp32": """
 [env:esp32dev]
 platform = espressif32
 board = esp32dev
@@ -78,9 +232,9 @@ lib_deps =
     adafruit/Adafruit MPU6050@^2.2.4
     adafruit/Adafruit BusIO@^1.14.1
     adafruit/Adafruit Unified Sensor@^1.1.9
-build_flags = -O2
+build_flags = -O2 -DBUILD_TIMESTAMP=0
 """,
-        "pico": """
+    "pico": """
 [env:pico]
 platform = raspberrypi
 board = pico
@@ -88,9 +242,9 @@ framework = arduino
 lib_deps = 
     adafruit/Adafruit MPU6050@^2.2.4
     adafruit/Adafruit BusIO@^1.14.1
-build_flags = -O2
+build_flags = -O2 -DBUILD_TIMESTAMP=0
 """,
-        "nano": """
+    "nano": """
 [env:nanoatmega328]
 platform = atmelavr
 board = nanoatmega328
@@ -98,9 +252,9 @@ framework = arduino
 lib_deps = 
     adafruit/Adafruit MPU6050@^2.2.4
     adafruit/Adafruit BusIO@^1.14.1
-build_flags = -O2
+build_flags = -O2 -DBUILD_TIMESTAMP=0
 """,
-        "stm32": """
+    "stm32": """
 [env:bluepill_f103c8]
 platform = ststm32
 board = bluepill_f103c8
@@ -109,45 +263,89 @@ upload_protocol = stlink
 lib_deps = 
     adafruit/Adafruit MPU6050@^2.2.4
     adafruit/Adafruit BusIO@^1.14.1
-build_flags = -O2
+build_flags = -O2 -DBUILD_TIMESTAMP=0
 """
-    }
+}
+# Stripped once at import rather than on every call
+_PLATFORMIO_CONFIGS = {k: v.strip() for k, v in _PLATFORMIO_CONFIGS.items()}
+
+def create_platformio_ini(platform: str):
+    """Create platformio.ini for each platform"""
+    config = _PLATFORMIO_CONFIGS[platform] + "\nextra_scripts = pre:ccache.py"
     
     Path(platform).mkdir(exist_ok=True)
-    Path(f"{platform}/platformio.ini").write_text(configs[platform].strip())
+    write_if_changed(Path(f"{platform}/platformio.ini"), config)
+    write_if_changed(Path(f"{platform}/ccache.py"), CCACHE_SCRIPT)
     Path(f"{platform}/src").mkdir(exist_ok=True)
     
     # Copy source file
-    if platform == "nano":
-        shutil.copy("../nano_firmware.ino", f"{platform}/src/main.cpp")
-    else:
-        shutil.copy(f"../{platform}_firmware.cpp", f"{platform}/src/main.cpp")
+    sync_source(platform)
+
+# Rough relative build time per platform, used to start the slowest builds first
+BUILD_COSTS = {
+    "esp32": 60,
+    "stm32": 25,
+    "pico": 20,
+    "nano": 10
+}
+
+# Firmware image extension produced by each platform's toolchain
+BINARY_EXTENSIONS = {
+    "esp32": ".bin",
+    "pico": ".uf2",
+    "nano": ".hex",
+    "stm32": ".bin"
+}
 
-def find_binary(build_dir: Path, env_name: str):
+def find_binary(build_dir: Path, env_name: str, platform: str):
     """Find compiled binary in PlatformIO build directory"""
     binary_dir = build_dir / ".pio" / "build" / env_name
+    ext = BINARY_EXTENSIONS[platform]
     
-    # Try common binary names
-    extensions = {
-        "esp32": ".bin",
-        "pico": ".uf2",
-        "nano": ".hex",
-        "stm32": ".bin"
-    }
-    
-    for platform, ext in extensions.items():
-        binary = binary_dir / f"firmware{ext}"
-        if binary.exists():
-            return binary
-        
-        # Alternative names
-        binary = binary_dir / f"main{ext}"
-        if binary.exists():
-            return binary
+    # One directory listing instead of probing each candidate name
+    try:
+        with os.scandir(binary_dir) as it:
+            names = [entry.name for entry in it
+                     if entry.is_file()
+                     and entry.name.endswith(ext)
+                     and entry.name.startswith(("firmware", "main"))]
+    except OSError:
+        return None
+    if not names:
+        return None
+    
+    # Prefer the canonical names, then any variant (e.g. firmware.factory.bin)
+    preferred = (f"firmware{ext}", f"main{ext}")
+    names.sort(key=lambda n: (preferred.index(n) if n in preferred else len(preferred), n))
+    return binary_dir / names[0]
+
+def _build_job(platform_dir: str, env_name: str, jobs: int):
+    """Pool worker: build one platform and hand its console output back to the parent"""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        success = build_platform(platform_dir, env_name, jobs)
+    return platform_dir, success, buf.getvalue()
+
+def build_all(platforms, jobs: int):
+    """Build all platforms concurrently, up to one worker process per platform"""
+    # Longest first, so a slow platform never starts last and gates the whole run
+    platforms = sorted(platforms, key=lambda p: -BUILD_COSTS.get(p[0], 0))
+    workers = min(len(platforms), os.cpu_count() or 1)
+    
+    if sys.platform == "win32":
+        # No fork on Windows; the executor handles spawn-based workers cleanly
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            return list(ex.map(_build_job, *zip(*platforms), [jobs] * len(platforms)))
     
-    return None
+    with multiprocessing.Pool(processes=workers) as pool:
+        return pool.starmap(_build_job, [(p, env, jobs) for p, env in platforms])
 
 def main():
+    parser = argparse.ArgumentParser(description="Compile all IRWP platform firmware")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="compile jobs per platform (default: CPU cores split across platforms)")
+    args = parser.parse_args()
+    
     print("IRWP Firmware Builder")
     print("This script will compile all platform firmware")
     
@@ -161,17 +359,28 @@ def main():
         ("stm32", "bluepill_f103c8")
     ]
     
+    # Platforms build side by side, so share the cores out between them
+    jobs = args.jobs or max(1, (os.cpu_count() or 1) // len(platforms))
+    
     results = {}
-    for platform, env in platforms:
-        results[platform] = build_platform(platform, env)
+    report = io.StringIO()
+    for platform, success, output in build_all(platforms, jobs):
+        # Each platform's log arrives in one piece so parallel builds don't interleave
+        report.write(output)
+        results[platform] = success
     
     # Summary
-    print("\n" + "="*50)
-    print("BUILD SUMMARY")
-    print("="*50)
-    for platform, success in results.items():
+    report.write("\n" + "="*50 + "\n")
+    report.write("BUILD SUMMARY\n")
+    report.write("="*50 + "\n")
+    for platform, _ in platforms:
+        success = results[platform]
         status = "✅ SUCCESS" if success else "❌ FAILED"
-        print(f"{platform.upper()}: {status}")
+        report.write(f"{platform.upper()}: {status}\n")
+    
+    # Flush the logs and summary with a single write
+    sys.stdout.write(report.getvalue())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,12 @@
 import time
 import json
-import serial
-import serial.tools.list_ports
 from PyQt6.QtCore import QObject, pyqtSignal
 from gui.serial_worker import SerialWorker
 from utils.logger import SimpleLogger
+from utils.ports import cached_comports, detect_platform
+
+# Wire format of the one command sent per attack phase
+SET_GROUP_TEMPLATE = b'{"cmd":"SET_GROUP","params":{"group":%d,"intensity":%d}}\n'
 
 class ArduinoInterface(QObject):
     connected = pyqtSignal(str)
@@ -26,13 +28,13 @@ class ArduinoInterface(QObject):
         """Auto-detect and connect to microcontroller by VID/PID"""
         self.logger.log("AUTOCONNECT_START", {})
         
-        ports = list(serial.tools.list_ports.comports())
+        ports = cached_comports()
         if not ports:
             self.logger.log("NO_PORTS_FOUND", {})
             return False
         
         for port in ports:
-            platform = self._detect_platform(port)
+            platform = detect_platform(port)
             if platform != "UNKNOWN":
                 try:
                     self.worker = SerialWorker(port.device)
@@ -53,18 +55,6 @@ class ArduinoInterface(QObject):
         
         return False
     
-    def _detect_platform(self, port) -> str:
-        """Detect microcontroller platform from USB VID/PID"""
-        if port.vid == 0x10C4 or "CP210" in port.description:
-            return "ESP32"
-        elif port.vid == 0x2E8A or "Pico" in port.description:
-            return "PICO"
-        elif port.vid in [0x2341, 0x2A03] or "Arduino" in port.description:
-            return "ARDUINO"
-        elif port.vid == 0x0483 or "STM32" in port.description:
-            return "STM32"
-        return "UNKNOWN"
-    
     def connect_manual(self, port: str, baud: int = 115200) -> bool:
         """Manual connection to specific port"""
         try:
@@ -98,7 +88,12 @@ class ArduinoInterface(QObject):
         """Send command to microcontroller"""
         if self.worker and self._connected:
             payload = {"cmd": cmd, "params": params or {}}
-            self.worker.send_command(payload)
+            params = payload["params"]
+            if cmd == "SET_GROUP" and type(params.get("group")) is int and type(params.get("intensity")) is int:
+                # Hot path during attacks: fill a fixed template instead of serialising
+                self.worker.send_raw(SET_GROUP_TEMPLATE % (params["group"], params["intensity"]))
+            else:
+                self.worker.send_command(payload)
             self.logger.log("COMMAND_SENT", payload)
         else:
             self.logger.log("COMMAND_FAILED", {"cmd": cmd, "reason": "not_connected"})
@@ -1,7 +1,9 @@
 import json
+import functools
 from pathlib import Path
 from PyQt6.QtCore import QObject, pyqtSignal
 from utils.logger import SimpleLogger
+from utils.validators import validate_pattern
 
 class PatternLoader(QObject):
     pattern_loaded = pyqtSignal(str, dict)
@@ -11,12 +13,19 @@ class PatternLoader(QObject):
         super().__init__()
         self.patterns_dir = Path(patterns_dir)
         self.patterns = {}
+        self._cache_mtime = None
+        self._cache_names = None
+        # Per-instance memo of name -> pattern; cleared whenever patterns reload
+        self._get_cached = functools.lru_cache(maxsize=32)(self._lookup)
         self.logger = SimpleLogger("logs/patterns.log")
         self.load_patterns()
     
     def load_patterns(self):
         """Load built-in and custom attack patterns"""
         self.patterns_dir.mkdir(exist_ok=True)
+        self._cache_mtime = self._dir_mtime()
+        self._cache_names = None
+        self._get_cached.cache_clear()
         
         # Built-in patterns (embedded)
         self.patterns = {
@@ -65,34 +74,35 @@ class PatternLoader(QObject):
             try:
                 with open(file) as f:
                     data = json.load(f)
-                    if self._validate_pattern(data):
+                    valid, error = validate_pattern(data)
+                    if valid:
+                        # Validated once here; lookups hand out the dict as-is
                         self.patterns[file.stem.upper()] = data
                         self.logger.log("PATTERN_LOADED", {"name": file.stem})
                     else:
-                        self.logger.log("PATTERN_INVALID", {"file": str(file)})
-                        self.pattern_error.emit(f"Invalid pattern: {file.name}")
+                        self.logger.log("PATTERN_INVALID", {"file": str(file), "error": error})
+                        self.pattern_error.emit(f"Invalid pattern: {file.name} ({error})")
             except Exception as e:
                 self.logger.log("PATTERN_LOAD_ERROR", {"file": str(file), "error": str(e)})
                 self.pattern_error.emit(f"Failed to load {file.name}: {e}")
     
-    def _validate_pattern(self, pattern: dict) -> bool:
-        """Validate pattern structure"""
-        try:
-            if "sequence" not in pattern or not isinstance(pattern["sequence"], list):
-                return False
-            for phase in pattern["sequence"]:
-                if not all(k in phase for k in ["group", "intensity", "duration_ms"]):
-                    return False
-                if not (0 <= phase["intensity"] <= 255):
-                    return False
-            return True
-        except:
-            return False
+    def _lookup(self, name: str) -> dict:
+        return self.patterns.get(name.upper(), {})
     
     def get_pattern(self, name: str) -> dict:
         """Get pattern by name (case-insensitive)"""
-        return self.patterns.get(name.upper(), {})
+        return self._get_cached(name)
+    
+    def _dir_mtime(self):
+        try:
+            return self.patterns_dir.stat().st_mtime_ns
+        except OSError:
+            return None
     
     def list_patterns(self) -> list:
-        """List all available pattern names"""
-        return sorted(self.patterns.keys())
+        """List all available pattern names, rescanning only if user_attacks/ changed"""
+        if self._dir_mtime() != self._cache_mtime:
+            self.load_patterns()
+        if self._cache_names is None:
+            self._cache_names = sorted(self.patterns.keys())
+        return list(self._cache_names)
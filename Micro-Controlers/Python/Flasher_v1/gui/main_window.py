@@ -1,21 +1,23 @@
+import os
+import re
+import mmap
 import sys
 import time
 import random
-import subprocess
+import asyncio
+import collections
 from pathlib import Path
-from datetime import datetime
 from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QObject
-from PyQt6.QtGui import QFont, QTextCursor
+from PyQt6.QtCore import (Qt, QThread, pyqtSignal, pyqtSlot, QTimer, QObject, QMetaObject, Q_ARG,
+                          QRunnable, QThreadPool, QMutex, QMutexLocker)
+from PyQt6.QtGui import QFont, QFontMetrics, QPixmap, QPainter, QColor
 
 from core.arduino_interface import ArduinoInterface
 from gui.orchestrator import AttackOrchestrator
 from core.pattern_loader import PatternLoader
 from utils.logger import SimpleLogger
 from utils.validators import validate_config
-
-# Flashing support
-import serial.tools.list_ports
+from utils.ports import cached_comports, invalidate_comports, find_platform_port, detect_platform
 
 ASCII_BANNER = """
 ╔══════════════════════════════════════════════════════════════╗
@@ -29,14 +31,62 @@ ASCII_BANNER = """
 ╚══════════════════════════════════════════════════════════════╝
 """
 
+# Flash tool output is matched as raw bytes, before any decoding. One combined
+# pattern finds whichever marker comes first; groups: 1 writing, 2 verified, 3 error
+PROGRESS_RE = re.compile(rb"(Writing)|(Hash of data verified)|((?i:error|failed))")
+ERR_RE = re.compile(rb"(?i)error|failed")
+
+# The whole theme, set once on the QApplication so it is parsed a single time.
+# Special widgets are picked out by objectName; status labels by their "state"
+APP_STYLE = """
+    QWidget { background-color: #2b2b2b; color: #ffffff; }
+    QGroupBox { border: 2px solid #555; margin-top: 10px; padding-top: 10px; }
+    QPushButton { background-color: #3c3c3c; border: 1px solid #555; padding: 8px; }
+    QPushButton:hover { background-color: #4c4c4c; }
+    QPushButton:checked { background-color: #d32f2f; }
+    QTextEdit, QPlainTextEdit { background-color: #1e1e1e; border: 1px solid #555; font-family: monospace; }
+    QProgressBar { background-color: #1e1e1e; border: 1px solid #555; }
+    QProgressBar::chunk { background-color: #4fc3f7; }
+    
+    QPushButton#flashBtn { background-color: #f57f17; color: white; font-weight: bold; }
+    QPushButton#safetyBtn { background-color: #d32f2f; font-weight: bold; padding: 15px; }
+    QPushButton#safetyBtn:checked { background-color: #388e3c; }
+    QPushButton#armBtn { background-color: #388e3c; font-size: 20px; font-weight: bold; padding: 25px; }
+    QPushButton#armBtn:checked { background-color: #d32f2f; }
+    QPushButton#emergencyBtn { background-color: #000; color: #f00; border: 3px solid #f00; font-size: 22px; font-weight: bold; padding: 20px; }
+    QLabel#cycleDisplay { font-size: 24px; font-weight: bold; color: #4fc3f7; }
+    
+    QLabel[state="ok"] { color: #00ff00; font-weight: bold; }
+    QLabel[state="bad"] { color: #ff5555; font-weight: bold; }
+    QLabel[state="alert"] { color: #ff0000; font-weight: bold; font-size: 18px; }
+    
+    QLabel#toast { background-color: #d32f2f; color: #fff; padding: 8px; border-radius: 4px; font-weight: bold; }
+    QLabel#toast[state="ok"] { background-color: #388e3c; }
+"""
+
+def set_state(widget: QWidget, state: str):
+    """Switch a widget between APP_STYLE [state=...] rules"""
+    widget.setProperty("state", state)
+    # Property selectors are only re-evaluated on a re-polish
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+# Lines kept in the live feed; older blocks are dropped by the document itself
+FEED_MAX_LINES = 1000
+
+# Platforms whose flash tool is addressed by serial port, so several boards can
+# be flashed side by side. PICO goes through the shared RPI-RP2 drive and STM32
+# through the first ST-Link, so those are flashed one at a time.
+PORT_FLASHABLE = ("ESP32", "ARDUINO")
+
 class FirmwareFlasher(QObject):
     progress_signal = pyqtSignal(str, int)
     error_signal = pyqtSignal(str)
     success_signal = pyqtSignal(str)
     
-    def __init__(self):
+    def __init__(self, logger: SimpleLogger = None):
         super().__init__()
-        self.logger = SimpleLogger("logs/flasher.log")
+        self.logger = logger or SimpleLogger("logs/flasher.log")
         self.platform_tools = {
             "ESP32": self.flash_esp32,
             "PICO": self.flash_pico,
@@ -50,38 +100,45 @@ class FirmwareFlasher(QObject):
             "ARDUINO": "firmware/nano_firmware.hex",
             "STM32": "firmware/stm32_firmware.bin"
         }
+        
+        # Created lazily on the flasher's own thread, which drives it
+        self._loop = None
+        self._bootloader_cache = None
     
-    def detect_platform(self, port) -> str:
-        if port.vid == 0x10C4 or "CP210" in port.description:
-            return "ESP32"
-        elif port.vid == 0x2E8A or "Pico" in port.description:
-            return "PICO"
-        elif port.vid in [0x2341, 0x2A03] or "Arduino" in port.description:
-            return "ARDUINO"
-        elif port.vid == 0x0483 or "STM32" in port.description:
-            return "STM32"
-        return "UNKNOWN"
-    
+    @pyqtSlot(str, str)
     def flash(self, platform: str, port: str):
+        # Invoked queued on the flasher's QThread; the flash tool runs as an asyncio
+        # subprocess there and signals reach the GUI through queued connections
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._flash(platform, port))
+    
+    async def _flash(self, platform: str, port: str):
         if platform not in self.platform_tools:
             self.error_signal.emit(f"Unsupported platform: {platform}")
             return
         
         firmware_file = Path(self.firmware_files[platform])
-        if not firmware_file.exists():
+        try:
+            size = firmware_file.stat().st_size
+        except OSError:
             self.error_signal.emit(f"Firmware not found: {firmware_file}")
             return
+        if size == 0:
+            self.error_signal.emit(f"Firmware is empty: {firmware_file}")
+            return
         
         self.progress_signal.emit(f"Flashing {platform} on {port}", 0)
         self.logger.log("FLASH_START", {"platform": platform, "port": port})
         
         try:
-            self.platform_tools[platform](port, firmware_file)
+            await self.platform_tools[platform](port, firmware_file)
         except Exception as e:
             self.error_signal.emit(f"Flash failed: {e}")
             self.logger.log("FLASH_ERROR", {"error": str(e)})
     
-    def flash_esp32(self, port: str, firmware: Path):
+    async def flash_esp32(self, port: str, firmware: Path):
         cmd = [
             sys.executable, "-m", "esptool",
             "--chip", "esp32",
@@ -90,27 +147,25 @@ class FirmwareFlasher(QObject):
             "write_flash", "-z",
             "0x1000", str(firmware)
         ]
-        self._run_flash_command(cmd, "ESP32")
+        await self._run_flash_command(cmd, "ESP32")
     
-    def flash_pico(self, port: str, firmware: Path):
+    async def flash_pico(self, port: str, firmware: Path):
         self.progress_signal.emit("Put Pico in bootloader mode...", 10)
         
         if sys.platform == "win32":
-            bootloader = self._find_bootloader_drive("RPI-RP2")
+            bootloader = self._find_bootloader((Path("/media"),))
         elif sys.platform == "darwin":
             bootloader = Path("/Volumes/RPI-RP2")
         else:
-            bootloader = self._find_bootloader_linux()
+            bootloader = self._find_bootloader((Path("/media"), Path("/mnt"), Path.home() / "media"))
         
         if not bootloader:
             cmd = ["picotool", "load", "-x", str(firmware)]
-            self._run_flash_command(cmd, "PICO")
+            await self._run_flash_command(cmd, "PICO")
         else:
-            dest = bootloader / firmware.name
-            cmd = ["cp", str(firmware), str(dest)]
-            self._run_flash_command(cmd, "PICO", use_shell=True)
+            self._copy_to_bootloader(firmware, bootloader / firmware.name)
     
-    def flash_arduino(self, port: str, firmware: Path):
+    async def flash_arduino(self, port: str, firmware: Path):
         cmd = [
             "avrdude",
             "-C", "avrdude.conf",
@@ -119,54 +174,139 @@ class FirmwareFlasher(QObject):
             "-b", "115200",
             "-D", "-U", f"flash:w:{firmware}:i"
         ]
-        self._run_flash_command(cmd, "ARDUINO")
+        await self._run_flash_command(cmd, "ARDUINO", silent=True, port=port)
     
-    def flash_stm32(self, port: str, firmware: Path):
+    async def flash_stm32(self, port: str, firmware: Path):
         cmd = ["st-flash", "write", str(firmware), "0x8000000"]
-        self._run_flash_command(cmd, "STM32")
+        await self._run_flash_command(cmd, "STM32", silent=True, port=port)
     
-    def _find_bootloader_drive(self, name: str):
-        for drive in Path("/media").iterdir():
-            if name in drive.name:
-                return drive
+    def _find_bootloader(self, roots: tuple, name: str = "RPI-RP2", ttl: float = 5.0):
+        # A recent hit is reused while it is still mounted, skipping the mount scan
+        cached = self._bootloader_cache
+        if cached and cached[0] == roots and time.monotonic() - cached[1] < ttl and cached[2].exists():
+            return cached[2]
+        
+        for path in roots:
+            # scandir hands back names without a Path per entry; a missing root
+            # just raises instead of needing its own exists() probe
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if name in entry.name:
+                            child = Path(entry.path)
+                            self._bootloader_cache = (roots, time.monotonic(), child)
+                            return child
+            except OSError:
+                continue
         return None
     
-    def _find_bootloader_linux(self):
-        for path in [Path("/media"), Path("/mnt"), Path.home() / "media"]:
-            if path.exists():
-                for child in path.iterdir():
-                    if "RPI-RP2" in child.name:
-                        return child
-        return None
+    def _handle_flash_output(self, raw: bytes) -> bool:
+        # Returns True when the tool reported an error and should be stopped
+        raw = raw.strip()
+        if not raw:
+            return False
+        line = raw.decode(errors="replace")
+        self.logger.log("FLASH_OUTPUT", {"line": line})
+        
+        m = PROGRESS_RE.search(raw)
+        if m is None:
+            return False
+        
+        if m.lastindex == 1:
+            self.progress_signal.emit(line, 50)
+        elif m.lastindex == 2:
+            self.progress_signal.emit(line, 90)
+        
+        # A progress marker can still be followed by an error on the same line
+        if m.lastindex == 3 or ERR_RE.search(raw, m.end()):
+            self.error_signal.emit(line)
+            return True
+        return False
     
-    def _run_flash_command(self, cmd: list, platform: str, use_shell: bool = False):
+    def _copy_to_bootloader(self, firmware: Path, dest: Path, chunk_size: int = 1 << 20):
+        # The RP2 bootloader flashes whatever UF2 lands on its drive, so a plain
+        # file copy is the whole job; fsync makes sure it has reached the device
+        try:
+            with open(firmware, "rb") as src, open(dest, "wb") as dst:
+                total = os.fstat(src.fileno()).st_size
+                if sys.platform.startswith("linux"):
+                    # Kernel-side file-to-file copy; the bytes never enter Python
+                    offset = 0
+                    while offset < total:
+                        sent = os.sendfile(dst.fileno(), src.fileno(), offset, min(chunk_size, total - offset))
+                        if sent == 0:
+                            raise OSError(f"short copy ({offset} of {total} bytes)")
+                        offset += sent
+                        self.progress_signal.emit(f"Copying {firmware.name}", 20 + 75 * offset // total)
+                else:
+                    # Map the image once and write straight out of the mapping
+                    with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        view = memoryview(mm)
+                        try:
+                            for offset in range(0, total, chunk_size):
+                                dst.write(view[offset:offset + chunk_size])
+                                copied = min(offset + chunk_size, total)
+                                self.progress_signal.emit(f"Copying {firmware.name}", 20 + 75 * copied // total)
+                        finally:
+                            view.release()
+                    dst.flush()
+                os.fsync(dst.fileno())
+        except OSError as e:
+            self.error_signal.emit(f"Copy to bootloader failed: {e}")
+            return
+        
+        self.progress_signal.emit("Flash complete!", 100)
+        self.success_signal.emit("PICO")
+        self.logger.log("FLASH_SUCCESS", {"platform": "PICO"})
+    
+    async def _run_flash_command(self, cmd: list, platform: str, silent: bool = False, port: str = ""):
         try:
             self.progress_signal.emit(f"Running: {' '.join(cmd)}", 20)
             
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                shell=use_shell
-            )
+            if silent:
+                # Nothing in this tool's output drives progress, so don't drain it
+                # through Python: send it straight to a log file and just wait.
+                # One file per port, so boards flashed side by side don't interleave
+                name = f"flash_{platform.lower()}"
+                tag = re.sub(r"[^\w.-]+", "_", port).strip("_")
+                if tag:
+                    name += f"_{tag}"
+                log_path = self.logger.log_file.with_name(f"{name}.log")
+                with open(log_path, "ab") as log_fp:
+                    process = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdout=log_fp,
+                        stderr=asyncio.subprocess.STDOUT
+                    )
+                    self.progress_signal.emit(f"Flashing... (output in {log_path})", 50)
+                    await process.wait()
+                if process.returncode != 0:
+                    self.error_signal.emit(f"Process exited with code {process.returncode} (see {log_path})")
+                    return
+            else:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT
+                )
             
-            for line in iter(process.stdout.readline, ''):
-                line = line.strip()
-                if line:
-                    self.logger.log("FLASH_OUTPUT", {"line": line})
-                    
-                    if "Writing" in line:
-                        self.progress_signal.emit(line, 50)
-                    elif "Hash of data verified" in line:
-                        self.progress_signal.emit(line, 90)
-                    
-                    if "error" in line.lower() or "failed" in line.lower():
-                        self.error_signal.emit(line)
+            # Read raw chunks and split on \r as well as \n: esptool/avrdude redraw
+            # their progress with carriage returns, which readline() would sit on
+            pending = b""
+            while process.stdout is not None:
+                chunk = await process.stdout.read(4096)
+                fragments = re.split(rb"[\r\n]", pending + chunk)
+                # The last fragment is an unfinished line unless the stream has ended
+                pending = fragments.pop() if chunk else b""
+                for fragment in fragments:
+                    if self._handle_flash_output(fragment):
                         process.kill()
+                        await process.wait()
                         return
+                if not chunk:
+                    break
             
-            process.wait()
+            await process.wait()
             if process.returncode == 0:
                 self.progress_signal.emit("Flash complete!", 100)
                 self.success_signal.emit(platform)
@@ -179,6 +319,76 @@ class FirmwareFlasher(QObject):
         except Exception as e:
             self.error_signal.emit(f"Exception: {e}")
 
+class PortScanner(QRunnable):
+    """Enumerate serial ports on a pool thread; comports() can take a few hundred ms"""
+    class _Signals(QObject):
+        done = pyqtSignal(object)
+    
+    def __init__(self, force: bool = False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.force = force
+        self.signals = self._Signals()
+    
+    def run(self):
+        if self.force:
+            invalidate_comports()
+        self.signals.done.emit(cached_comports())
+
+class FlashBatch(QObject):
+    """Aggregate progress of a multi-device flash, keyed by port"""
+    progress_signal = pyqtSignal(dict)
+    finished = pyqtSignal()
+    
+    def __init__(self, jobs: list):
+        super().__init__()
+        self._mutex = QMutex()
+        self._state = {port: [platform, "Queued", 0] for platform, port in jobs}
+        self._remaining = len(jobs)
+        self.runnables = []
+    
+    def update(self, port: str, status: str, percent: int = None):
+        # Called from pool threads; the signal is queued to the GUI thread
+        with QMutexLocker(self._mutex):
+            row = self._state[port]
+            row[1] = status
+            if percent is not None:
+                row[2] = percent
+            snapshot = {p: tuple(r) for p, r in self._state.items()}
+        self.progress_signal.emit(snapshot)
+    
+    def done(self):
+        with QMutexLocker(self._mutex):
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last:
+            self.finished.emit()
+
+class FlashRunnable(QRunnable):
+    """Flash one board on a pool thread with its own flasher and event loop"""
+    def __init__(self, batch: FlashBatch, platform: str, port: str, logger: SimpleLogger):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.batch = batch
+        self.platform = platform
+        self.port = port
+        self.flasher = FirmwareFlasher(logger)
+        # The flasher lives on the GUI thread, so AutoConnection would queue these
+        # lambdas there; force direct calls on the pool thread that emits them.
+        # batch.update is mutex-guarded and queues its own signal to the GUI
+        direct = Qt.ConnectionType.DirectConnection
+        self.flasher.progress_signal.connect(lambda message, percent: batch.update(port, message, percent), direct)
+        self.flasher.error_signal.connect(lambda error: batch.update(port, f"Error: {error}"), direct)
+        self.flasher.success_signal.connect(lambda platform: batch.update(port, "Done", 100), direct)
+    
+    def run(self):
+        try:
+            asyncio.run(self.flasher._flash(self.platform, self.port))
+        except Exception as e:
+            self.batch.update(self.port, f"Error: {e}")
+        finally:
+            self.batch.done()
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -187,47 +397,68 @@ class MainWindow(QMainWindow):
         self.arduino = ArduinoInterface()
         self.patterns = PatternLoader()
         self.flasher = FirmwareFlasher()
+        self.flash_thread = QThread()
+        self.flash_thread.setObjectName("firmware-flasher")
+        self.flasher.moveToThread(self.flash_thread)
+        self.flash_thread.start()
+        # Multi-device flashing: one pool thread per board, up to one per core
+        self.flash_pool = QThreadPool.globalInstance()
+        self.flash_pool.setMaxThreadCount(os.cpu_count() or 1)
+        self.flash_batch = None
+        self._flash_active = False  # single-board flash running on flash_thread
+        self._port_scanner = None
+        self._port_waiters = []
+        self._port_forced_waiters = []
+        self._flash_confirm = None
+        self._banner_pix = None
+        self._auto_connect_inflight = False
+        # Incoming messages are routed by their "type"; unknown types are ignored
+        self._rx_handlers = {
+            "status": self._on_rx_status
+        }
         self.orchestrator = AttackOrchestrator(self.arduino, self.patterns)
         
-        # Connect signals
-        self.arduino.connected.connect(self.on_arduino_connected)
-        self.arduino.disconnected.connect(self.on_arduino_disconnected)
-        self.arduino.response_received.connect(self.on_arduino_response)
-        
-        self.orchestrator.status_signal.connect(self.update_status)
-        self.orchestrator.cycle_signal.connect(self.update_cycle)
-        self.orchestrator.error_signal.connect(self.show_error)
-        self.orchestrator.phase_signal.connect(self.on_phase)
-        
-        self.flasher.progress_signal.connect(self.on_flash_progress)
-        self.flasher.error_signal.connect(self.on_flash_error)
-        self.flasher.success_signal.connect(self.on_flash_success)
+        # Connect signals. ArduinoInterface re-emits on the GUI thread (the serial
+        # worker's signals are queued into it), so its slots can be called directly
+        direct = Qt.ConnectionType.DirectConnection
+        queued = Qt.ConnectionType.QueuedConnection
+        self.arduino.connected.connect(self.on_arduino_connected, direct)
+        self.arduino.disconnected.connect(self.on_arduino_disconnected, direct)
+        self.arduino.response_received.connect(self.on_arduino_response, direct)
+        
+        # The orchestrator emits from its own thread, so these must stay queued;
+        # the slots coalesce into timers and keep the per-event cost low
+        self.orchestrator.status_signal.connect(self.update_status, queued)
+        self.orchestrator.cycle_signal.connect(self.update_cycle, queued)
+        self.orchestrator.error_signal.connect(self.show_error, queued)
+        
+        # The GUI polls executed phases while the orchestrator runs, rather than
+        # receiving a queued signal per phase
+        self.phase_timer = QTimer(self)
+        self.phase_timer.setInterval(50)
+        self.phase_timer.timeout.connect(self.poll_phases)
+        self.orchestrator.started.connect(self.phase_timer.start, queued)
+        self.orchestrator.finished.connect(self.phase_timer.stop, queued)
+        self.orchestrator.finished.connect(self.poll_phases, queued)
+        
+        # The flasher lives on flash_thread; results always come back queued
+        self.flasher.progress_signal.connect(self.on_flash_progress, queued)
+        self.flasher.error_signal.connect(self.on_flash_error, queued)
+        self.flasher.success_signal.connect(self.on_flash_success, queued)
         
         self.connected_platform = None
         
         self.init_ui()
-        QTimer.singleShot(1000, self.auto_connect)
     
     def init_ui(self):
         self.setWindowTitle("IRWP v2.5 - Multi-Platform Controller & Flasher")
         self.setGeometry(100, 100, 1600, 900)
         
-        self.setStyleSheet("""
-            QWidget { background-color: #2b2b2b; color: #ffffff; }
-            QGroupBox { border: 2px solid #555; margin-top: 10px; padding-top: 10px; }
-            QPushButton { background-color: #3c3c3c; border: 1px solid #555; padding: 8px; }
-            QPushButton:hover { background-color: #4c4c4c; }
-            QPushButton:checked { background-color: #d32f2f; }
-            QTextEdit { background-color: #1e1e1e; border: 1px solid #555; font-family: monospace; }
-            QProgressBar { background-color: #1e1e1e; border: 1px solid #555; }
-            QProgressBar::chunk { background-color: #4fc3f7; }
-        """)
-        
         central = QWidget()
         layout = QVBoxLayout(central)
         
-        banner = QLabel(ASCII_BANNER)
-        banner.setFont(QFont("Courier", 9))
+        banner = QLabel()
+        banner.setPixmap(self.banner_pixmap())
         layout.addWidget(banner)
         
         splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -243,6 +474,32 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(splitter)
         self.setCentralWidget(central)
+        
+        # Non-modal notifications: a modal box would spin a nested event loop and
+        # hold up orchestrator and serial signals while it is open
+        self._toast = QLabel(self)
+        self._toast.setObjectName("toast")
+        self._toast.hide()
+        self._toast_timer = QTimer(self)
+        self._toast_timer.setSingleShot(True)
+        self._toast_timer.timeout.connect(self._toast.hide)
+    
+    def banner_pixmap(self) -> QPixmap:
+        # The banner never changes, so it is rasterised once instead of having its
+        # text shaped and laid out again on every resize
+        if self._banner_pix is None:
+            font = QFont("Courier", 9)
+            text = ASCII_BANNER.strip("\n")
+            rect = QFontMetrics(font).boundingRect(0, 0, 10000, 10000, Qt.AlignmentFlag.AlignLeft, text)
+            pix = QPixmap(rect.size())
+            pix.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pix)
+            painter.setFont(font)
+            painter.setPen(QColor("#ffffff"))
+            painter.drawText(pix.rect(), Qt.AlignmentFlag.AlignLeft, text)
+            painter.end()
+            self._banner_pix = pix
+        return self._banner_pix
     
     def create_left_panel(self):
         panel = QWidget()
@@ -263,7 +520,7 @@ class MainWindow(QMainWindow):
         manual_layout.addWidget(self.port_combo)
         
         self.refresh_btn = QPushButton("Refresh")
-        self.refresh_btn.clicked.connect(self.refresh_ports)
+        self.refresh_btn.clicked.connect(lambda: self.refresh_ports(force=True))
         manual_layout.addWidget(self.refresh_btn)
         conn_layout.addLayout(manual_layout)
         
@@ -277,7 +534,7 @@ class MainWindow(QMainWindow):
         conn_layout.addWidget(self.disconnect_btn)
         
         self.conn_status = QLabel("Status: Disconnected")
-        self.conn_status.setStyleSheet("color: #ff5555; font-weight: bold;")
+        self.conn_status.setProperty("state", "bad")
         conn_layout.addWidget(self.conn_status)
         
         self.platform_info = QLabel("Platform: None")
@@ -296,9 +553,13 @@ class MainWindow(QMainWindow):
         
         self.flash_btn = QPushButton("Flash Selected Platform")
         self.flash_btn.clicked.connect(self.flash_firmware)
-        self.flash_btn.setStyleSheet("background-color: #f57f17; color: white; font-weight: bold;")
+        self.flash_btn.setObjectName("flashBtn")
         flash_layout.addWidget(self.flash_btn)
         
+        self.flash_all_btn = QPushButton("Flash All Detected")
+        self.flash_all_btn.clicked.connect(self.flash_all_firmware)
+        flash_layout.addWidget(self.flash_all_btn)
+        
         self.flash_progress = QProgressBar()
         self.flash_progress.setRange(0, 100)
         flash_layout.addWidget(self.flash_progress)
@@ -306,6 +567,11 @@ class MainWindow(QMainWindow):
         self.flash_status = QLabel("Ready to flash")
         flash_layout.addWidget(self.flash_status)
         
+        # The per-board table is only needed for multi-device flashing, so it is
+        # built the first time that runs (see flash_table_widget)
+        self.flash_table = None
+        self._flash_layout = flash_layout
+        
         flash_group.setLayout(flash_layout)
         layout.addWidget(flash_group)
         
@@ -316,10 +582,7 @@ class MainWindow(QMainWindow):
         self.safety_btn = QPushButton("SAFETY OFF")
         self.safety_btn.setCheckable(True)
         self.safety_btn.toggled.connect(self.toggle_safety)
-        self.safety_btn.setStyleSheet("""
-            QPushButton { background-color: #d32f2f; font-weight: bold; padding: 15px; }
-            QPushButton:checked { background-color: #388e3c; }
-        """)
+        self.safety_btn.setObjectName("safetyBtn")
         safety_layout.addWidget(self.safety_btn)
         
         self.safety_status = QLabel("System: SAFE")
@@ -354,12 +617,17 @@ class MainWindow(QMainWindow):
         target_group = QGroupBox("🎯 Targets")
         target_layout = QVBoxLayout()
         
+        # Selection is mirrored in one bitmask (bit i = _target_names[i]) so
+        # select/clear-all and arming never have to poll the checkboxes
         self.target_checks = {}
-        targets = ["Walmart", "Target", "Costco", "Kroger", "Custom"]
-        for target in targets:
+        self._target_names = ["Walmart", "Target", "Costco", "Kroger", "Custom"]
+        self._target_mask = 0
+        for bit, target in enumerate(self._target_names):
             cb = QCheckBox(target)
+            cb.toggled.connect(lambda checked, bit=bit: self._set_target_bit(bit, checked))
             self.target_checks[target] = cb
             target_layout.addWidget(cb)
+        self._target_group = target_group
         
         btn_layout = QHBoxLayout()
         select_all = QPushButton("Select All")
@@ -394,6 +662,8 @@ class MainWindow(QMainWindow):
         self.cycle_spin = QSpinBox()
         self.cycle_spin.setRange(1, 999)
         self.cycle_spin.setValue(100)
+        self.cycle_spin.valueChanged.connect(self.update_cycle_limit)
+        self.update_cycle_limit(self.cycle_spin.value())
         config_layout.addWidget(self.cycle_spin, 2, 1)
         
         config_layout.addWidget(QLabel("Jitter %:"), 3, 0)
@@ -406,6 +676,23 @@ class MainWindow(QMainWindow):
         config_group.setLayout(config_layout)
         layout.addWidget(config_group)
         
+        # Arm-time settings are kept current from the widgets' change signals, so
+        # arming doesn't have to read every widget back
+        self._config = {
+            "targets": [],
+            "camera_duration": self.cam_spin.value(),
+            "injection_duration": self.data_spin.value(),
+            "max_cycles": self.cycle_spin.value(),
+            "jitter_range": self.jitter_spin.value(),
+            "pattern_name": self.pattern_combo.currentText()
+        }
+        for key, signal in (("camera_duration", self.cam_spin.valueChanged),
+                            ("injection_duration", self.data_spin.valueChanged),
+                            ("max_cycles", self.cycle_spin.valueChanged),
+                            ("jitter_range", self.jitter_spin.valueChanged),
+                            ("pattern_name", self.pattern_combo.currentTextChanged)):
+            signal.connect(lambda value, key=key: self._config.__setitem__(key, value))
+        
         layout.addStretch()
         return panel
     
@@ -420,10 +707,7 @@ class MainWindow(QMainWindow):
         self.arm_btn = QPushButton("SYSTEM ARMED")
         self.arm_btn.setCheckable(True)
         self.arm_btn.clicked.connect(self.toggle_arm)
-        self.arm_btn.setStyleSheet("""
-            QPushButton { background-color: #388e3c; font-size: 20px; font-weight: bold; padding: 25px; }
-            QPushButton:checked { background-color: #d32f2f; }
-        """)
+        self.arm_btn.setObjectName("armBtn")
         master_layout.addWidget(self.arm_btn)
         
         self.arm_status = QLabel("Status: SAFE")
@@ -436,17 +720,35 @@ class MainWindow(QMainWindow):
         counter_group = QGroupBox("📊 Cycle Counter")
         counter_layout = QVBoxLayout()
         self.cycle_display = QLabel("0 / 0")
-        self.cycle_display.setStyleSheet("font-size: 24px; font-weight: bold; color: #4fc3f7;")
+        self.cycle_display.setObjectName("cycleDisplay")
         counter_layout.addWidget(self.cycle_display)
+        
+        # The counter label is redrawn at most once per tick with the latest count
+        self._cycle_count = 0
+        self._cycle_timer = QTimer(self)
+        self._cycle_timer.setSingleShot(True)
+        self._cycle_timer.setInterval(30)
+        self._cycle_timer.timeout.connect(self.flush_cycle)
         counter_group.setLayout(counter_layout)
         layout.addWidget(counter_group)
         
         # Status Feed
         feed_group = QGroupBox("📜 Live Feed")
         feed_layout = QVBoxLayout()
-        self.status_feed = QTextEdit()
+        self.status_feed = QPlainTextEdit()
         self.status_feed.setReadOnly(True)
         self.status_feed.setMaximumHeight(300)
+        self.status_feed.setMaximumBlockCount(FEED_MAX_LINES)
+        
+        # Messages are buffered and appended once per tick instead of one layout each;
+        # anything beyond what the feed keeps would be discarded on append anyway
+        self._feed_buf = collections.deque(maxlen=FEED_MAX_LINES)
+        self._ts_sec = None
+        self._ts_str = ""
+        self._feed_timer = QTimer(self)
+        self._feed_timer.setSingleShot(True)
+        self._feed_timer.setInterval(30)
+        self._feed_timer.timeout.connect(self.flush_status)
         feed_layout.addWidget(self.status_feed)
         feed_group.setLayout(feed_layout)
         layout.addWidget(feed_group)
@@ -454,21 +756,69 @@ class MainWindow(QMainWindow):
         # Emergency Stop
         emergency_btn = QPushButton("🛑 EMERGENCY STOP")
         emergency_btn.clicked.connect(self.emergency_stop)
-        emergency_btn.setStyleSheet("""
-            QPushButton { background-color: #000; color: #f00; border: 3px solid #f00; font-size: 22px; font-weight: bold; padding: 20px; }
-        """)
+        emergency_btn.setObjectName("emergencyBtn")
         layout.addWidget(emergency_btn)
         
         layout.addStretch()
         return panel
     
-    def refresh_ports(self):
+    def scan_ports(self, callback, force: bool = False):
+        """Enumerate ports on the pool and call callback(ports) on the GUI thread;
+        callers arriving while a scan is running share its result"""
+        running = self._port_scanner
+        if running is not None and force and not running.force:
+            # The running scan may answer from the cache; rescan once it is done
+            self._port_forced_waiters.append(callback)
+            return
+        self._port_waiters.append(callback)
+        if running is None:
+            self._start_port_scan(force)
+    
+    def _start_port_scan(self, force: bool):
+        scanner = PortScanner(force)
+        scanner.signals.done.connect(self.on_ports_scanned, Qt.ConnectionType.QueuedConnection)
+        self._port_scanner = scanner
+        QThreadPool.globalInstance().start(scanner)
+    
+    def on_ports_scanned(self, ports: tuple):
+        self._port_scanner = None
+        waiters, self._port_waiters = self._port_waiters, []
+        if self._port_forced_waiters:
+            self._port_waiters, self._port_forced_waiters = self._port_forced_waiters, []
+            self._start_port_scan(True)
+        for callback in waiters:
+            callback(ports)
+    
+    def refresh_ports(self, force: bool = False):
+        self.scan_ports(self.populate_ports, force)
+    
+    def populate_ports(self, ports: tuple):
+        current = self.port_combo.currentText()
         self.port_combo.clear()
-        ports = serial.tools.list_ports.comports()
-        for port in ports:
-            self.port_combo.addItem(f"{port.device} - {port.description}")
+        self.port_combo.addItems([f"{port.device} - {port.description}" for port in ports])
+        index = self.port_combo.findText(current)
+        if index >= 0:
+            self.port_combo.setCurrentIndex(index)
     
     def auto_connect(self):
+        # Startup, the button and the post-flash retry can all land here; only one
+        # attempt runs at a time and none once a board is connected
+        if self._auto_connect_inflight or self.arduino.connected:
+            return
+        self._auto_connect_inflight = True
+        # Enumerate off the GUI thread first; detect_and_connect then reuses the
+        # freshly cached list instead of scanning again
+        self.scan_ports(self._auto_connect_ports)
+    
+    def _auto_connect_ports(self, ports: tuple):
+        self._auto_connect_inflight = False
+        if self.arduino.connected:
+            return
+        # Nothing to probe without any serial ports
+        if not ports:
+            self.update_status("No ports present")
+            return
+        
         self.update_status("Auto-connecting...")
         if self.arduino.detect_and_connect():
             self.update_status(f"Auto-connected: {self.arduino.platform}")
@@ -501,7 +851,7 @@ class MainWindow(QMainWindow):
     def on_arduino_connected(self, platform: str):
         self.connected_platform = platform
         self.conn_status.setText(f"Connected: {platform}")
-        self.conn_status.setStyleSheet("color: #00ff00; font-weight: bold;")
+        set_state(self.conn_status, "ok")
         self.platform_info.setText(f"Platform: {platform}")
         self.connect_btn.setEnabled(False)
         self.disconnect_btn.setEnabled(True)
@@ -513,37 +863,46 @@ class MainWindow(QMainWindow):
     def on_arduino_disconnected(self):
         self.connected_platform = None
         self.conn_status.setText("Disconnected")
-        self.conn_status.setStyleSheet("color: #ff5555; font-weight: bold;")
+        set_state(self.conn_status, "bad")
         self.platform_info.setText("Platform: None")
         self.connect_btn.setEnabled(True)
         self.disconnect_btn.setEnabled(False)
         self.flash_btn.setEnabled(False)
     
     def on_arduino_response(self, data: dict):
-        if data.get("type") == "status":
-            self.update_status(f"Arduino: {data}")
+        handler = self._rx_handlers.get(data.get("type"))
+        if handler is not None:
+            handler(data)
+    
+    def _on_rx_status(self, data: dict):
+        self.update_status(f"Arduino: {data}")
+    
+    def confirm_flash(self, text: str) -> bool:
+        # One confirmation box for the session; only its text changes per flash
+        box = self._flash_confirm
+        if box is None:
+            box = QMessageBox(
+                QMessageBox.Icon.Question, "Flash Firmware", "",
+                QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel, self
+            )
+            box.setInformativeText("This will overwrite existing firmware!")
+            self._flash_confirm = box
+        box.setText(text)
+        return box.exec() == QMessageBox.StandardButton.Ok
     
     def flash_firmware(self):
         platform = self.flash_platform_combo.currentText()
         
-        reply = QMessageBox.question(
-            self, "Flash Firmware",
-            f"Flash {platform} firmware?\nThis will overwrite existing firmware!",
-            QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel
-        )
-        
-        if reply != QMessageBox.StandardButton.Ok:
+        if not self.confirm_flash(f"Flash {platform} firmware?"):
             return
         
         port = None
         if self.arduino.connected and self.arduino.platform == platform:
             port = "CURRENT"
         else:
-            ports = serial.tools.list_ports.comports()
-            for p in ports:
-                if self.flasher.detect_platform(p) == platform:
-                    port = p.device
-                    break
+            match = find_platform_port(platform)
+            if match:
+                port = match.device
         
         if not port:
             self.show_error(f"No {platform} found")
@@ -551,7 +910,69 @@ class MainWindow(QMainWindow):
         
         self.flash_progress.setValue(0)
         self.flash_btn.setEnabled(False)
-        self.flasher.flash(platform, port)
+        self._flash_active = True
+        QMetaObject.invokeMethod(
+            self.flasher, "flash", Qt.ConnectionType.QueuedConnection,
+            Q_ARG(str, platform), Q_ARG(str, port)
+        )
+    
+    def flash_all_firmware(self):
+        # Boards held open by the controller connection can't be flashed
+        busy = self.arduino.worker.port if self.arduino.worker else None
+        jobs = []
+        for port in cached_comports():
+            platform = detect_platform(port)
+            if platform in PORT_FLASHABLE and port.device != busy:
+                jobs.append((platform, port.device))
+        
+        if not jobs:
+            self.show_error("No flashable boards found")
+            return
+        
+        if not self.confirm_flash(f"Flash {len(jobs)} board(s)?"):
+            return
+        
+        self.flash_table_widget().setRowCount(0)
+        self.flash_btn.setEnabled(False)
+        self.flash_all_btn.setEnabled(False)
+        
+        batch = FlashBatch(jobs)
+        batch.progress_signal.connect(self.on_flash_batch_progress, Qt.ConnectionType.QueuedConnection)
+        batch.finished.connect(self.on_flash_batch_finished, Qt.ConnectionType.QueuedConnection)
+        self.flash_batch = batch
+        for platform, port in jobs:
+            runnable = FlashRunnable(batch, platform, port, self.flasher.logger)
+            batch.runnables.append(runnable)
+            self.flash_pool.start(runnable)
+        self.update_status(f"Flashing {len(jobs)} board(s) in parallel")
+    
+    def flash_table_widget(self) -> QTableWidget:
+        if self.flash_table is None:
+            table = QTableWidget(0, 4)
+            table.setHorizontalHeaderLabels(["Port", "Platform", "Status", "%"])
+            table.horizontalHeader().setStretchLastSection(True)
+            self._flash_layout.addWidget(table)
+            self.flash_table = table
+        return self.flash_table
+    
+    def on_flash_batch_progress(self, state: dict):
+        table = self.flash_table_widget()
+        if table.rowCount() != len(state):
+            table.setRowCount(len(state))
+        for row, (port, (platform, status, percent)) in enumerate(state.items()):
+            for col, text in enumerate((port, platform, status, str(percent))):
+                item = table.item(row, col)
+                if item is None:
+                    table.setItem(row, col, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+    
+    def on_flash_batch_finished(self):
+        self.flash_batch = None
+        self.flash_btn.setEnabled(True)
+        self.flash_all_btn.setEnabled(True)
+        self.update_status("Multi-device flash finished")
+        invalidate_comports()
     
     def on_flash_progress(self, message: str, percent: int):
         self.flash_status.setText(message)
@@ -559,17 +980,21 @@ class MainWindow(QMainWindow):
         self.update_status(f"Flash: {message}")
     
     def on_flash_error(self, error: str):
+        self._flash_active = False
         self.show_error(f"Flash error: {error}")
         self.flash_status.setText(error)
         self.flash_btn.setEnabled(True)
         self.flash_progress.setValue(0)
     
     def on_flash_success(self, platform: str):
+        self._flash_active = False
         self.flash_status.setText(f"{platform} flashed successfully!")
         self.flash_btn.setEnabled(True)
         self.flash_progress.setValue(100)
         self.update_status(f"{platform} firmware updated")
-        QMessageBox.information(self, "Success", f"{platform} firmware flashed!")
+        self.notify(f"{platform} firmware flashed!", ok=True)
+        # The board re-enumerates after flashing, so don't reuse the old port list
+        invalidate_comports()
         QTimer.singleShot(3000, self.auto_connect)
     
     def toggle_safety(self, engaged: bool):
@@ -577,12 +1002,12 @@ class MainWindow(QMainWindow):
             self.orchestrator.engage_safety()
             self.safety_btn.setText("SAFETY ENGAGED")
             self.safety_status.setText("System: ARMED")
-            self.safety_status.setStyleSheet("color: #00ff00; font-weight: bold;")
+            set_state(self.safety_status, "ok")
         else:
             self.orchestrator.disengage_safety()
             self.safety_btn.setText("SAFETY OFF")
             self.safety_status.setText("System: SAFE")
-            self.safety_status.setStyleSheet("color: #ff5555; font-weight: bold;")
+            set_state(self.safety_status, "bad")
             
             if self.arm_btn.isChecked():
                 self.arm_btn.setChecked(False)
@@ -592,9 +1017,21 @@ class MainWindow(QMainWindow):
         self.orchestrator.load_pattern(pattern_name)
         self.update_status(f"Pattern loaded: {pattern_name}")
     
+    def _set_target_bit(self, bit: int, checked: bool):
+        if checked:
+            self._target_mask |= 1 << bit
+        else:
+            self._target_mask &= ~(1 << bit)
+    
     def set_all_targets(self, checked: bool):
+        self._target_mask = (1 << len(self._target_names)) - 1 if checked else 0
+        # One repaint for the group and no per-box toggled round trips
+        self._target_group.setUpdatesEnabled(False)
         for cb in self.target_checks.values():
+            cb.blockSignals(True)
             cb.setChecked(checked)
+            cb.blockSignals(False)
+        self._target_group.setUpdatesEnabled(True)
     
     def toggle_arm(self):
         if self.arm_btn.isChecked():
@@ -608,25 +1045,20 @@ class MainWindow(QMainWindow):
                 self.arm_btn.setChecked(False)
                 return
             
-            targets = [t for t, cb in self.target_checks.items() if cb.isChecked()]
+            mask = self._target_mask
+            targets = [name for bit, name in enumerate(self._target_names) if mask >> bit & 1]
             if not targets:
                 self.show_error("No targets selected")
                 self.arm_btn.setChecked(False)
                 return
             
-            config = {
-                "targets": targets,
-                "camera_duration": self.cam_spin.value(),
-                "injection_duration": self.data_spin.value(),
-                "max_cycles": self.cycle_spin.value(),
-                "jitter_range": self.jitter_spin.value(),
-                "pattern_name": self.pattern_combo.currentText()
-            }
-            self.orchestrator.update_config(config)
+            # A copy: the orchestrator thread and the log writer both hold on to it
+            self._config["targets"] = targets
+            self.orchestrator.update_config(dict(self._config))
             
             self.arm_btn.setText("DISARM SYSTEM")
             self.arm_status.setText("Status: ATTACKING")
-            self.arm_status.setStyleSheet("color: #ff0000; font-weight: bold; font-size: 18px;")
+            set_state(self.arm_status, "alert")
             self.orchestrator.start_cycling()
             self.update_status("SYSTEM ARMED")
             
@@ -634,7 +1066,7 @@ class MainWindow(QMainWindow):
             self.orchestrator.stop_cycling()
             self.arm_btn.setText("ARM SYSTEM")
             self.arm_status.setText("Status: SAFE")
-            self.arm_status.setStyleSheet("color: #00ff00; font-weight: bold;")
+            set_state(self.arm_status, "ok")
             self.update_status("SYSTEM DISARMED")
     
     def emergency_stop(self):
@@ -643,31 +1075,79 @@ class MainWindow(QMainWindow):
         self.safety_btn.setChecked(False)
         self.arduino.send_command("EMERGENCY")
         self.update_status("EMERGENCY STOP ACTIVATED")
-        QMessageBox.critical(self, "EMERGENCY", "All systems halted!")
+        self.notify("EMERGENCY: All systems halted!", msec=8000)
     
     def update_status(self, message: str):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        if self.status_feed.document().blockCount() > 1000:
-            cursor = self.status_feed.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            cursor.movePosition(QTextCursor.MoveOperation.Down, QTextCursor.MoveMode.MoveAnchor, 100)
-            cursor.movePosition(QTextCursor.MoveOperation.Start, QTextCursor.MoveMode.KeepAnchor)
-            cursor.removeSelectedText()
-        
-        self.status_feed.append(f"[{timestamp}] {message}")
+        # Bursts land within the same second, so the formatted stamp is reused
+        now = int(time.time())
+        if now != self._ts_sec:
+            self._ts_sec = now
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+        self._feed_buf.append(f"[{self._ts_str}] {message}")
+        if not self._feed_timer.isActive():
+            self._feed_timer.start()
+    
+    def flush_status(self):
+        if self._feed_buf:
+            self.status_feed.appendPlainText("\n".join(self._feed_buf))
+            self._feed_buf.clear()
+    
+    def update_cycle_limit(self, value: int):
+        # Cached so update_cycle doesn't query the spinbox on every cycle
+        self._max_cycles = value
+        self._cycle_suffix = f" / {value}"
     
     def update_cycle(self, count: int):
-        self.cycle_display.setText(f"{count} / {self.cycle_spin.value()}")
+        self._cycle_count = count
+        if not self._cycle_timer.isActive():
+            self._cycle_timer.start()
         
-        if count >= self.cycle_spin.value() and self.arm_btn.isChecked():
+        # The limit check stays immediate; only the redraw is throttled
+        if count >= self._max_cycles and self.arm_btn.isChecked():
             self.arm_btn.setChecked(False)
             self.toggle_arm()
             self.update_status("Auto-disarmed: Max cycles reached")
     
-    def on_phase(self, phase: dict):
-        self.update_status(f"Phase: {phase['name']} | Group: {phase['group']} | Duration: {phase['duration']}ms")
+    def flush_cycle(self):
+        self.cycle_display.setText(str(self._cycle_count) + self._cycle_suffix)
+    
+    def poll_phases(self):
+        phases = self.orchestrator.take_phases()
+        if phases:
+            self.on_phase(phases)
+            self.update_status(f"[C{self.orchestrator.current_cycle}] {phases[-1].name}")
+    
+    def on_phase(self, phases: list):
+        for phase in phases:
+            self.update_status(f"Phase: {phase.name} | Group: {phase.group} | Duration: {phase.duration}ms")
     
     def show_error(self, error: str):
-        QMessageBox.critical(self, "Error", error)
+        self.notify(error)
         self.update_status(f"ERROR: {error}")
+    
+    def notify(self, message: str, ok: bool = False, msec: int = 4000):
+        toast = self._toast
+        toast.setText(message)
+        set_state(toast, "ok" if ok else "")
+        toast.adjustSize()
+        toast.move(self.width() - toast.width() - 20, self.height() - toast.height() - 20)
+        toast.raise_()
+        toast.show()
+        # A newer message restarts the timer rather than being hidden early
+        self._toast_timer.start(msec)
+    
+    def closeEvent(self, event):
+        # A running flash can't be interrupted (it blocks the flasher thread's
+        # loop) and cutting it off can brick the board: let it finish or stay open
+        if self._flash_active or self.flash_batch is not None:
+            answer = QMessageBox.question(
+                self, "Flash in progress",
+                "A firmware flash is still running.\n\nWait for it to finish and then close?"
+            )
+            if answer != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+        self.flash_thread.quit()
+        self.flash_thread.wait()
+        self.flash_pool.waitForDone()
+        super().closeEvent(event)
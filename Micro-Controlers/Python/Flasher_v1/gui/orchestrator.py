@@ -1,13 +1,25 @@
 import time
-import random
 import queue
+import collections
+from typing import NamedTuple
+import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal
 from utils.logger import SimpleLogger
 
+# Permutations are drawn in C rather than by random.shuffle's Python-level swaps
+_rng = np.random.default_rng()
+
+class Attack(NamedTuple):
+    """One queued phase for one target"""
+    target: str
+    group: int
+    intensity: int
+    duration: int
+    name: str
+
 class AttackOrchestrator(QThread):
     status_signal = pyqtSignal(str)
     cycle_signal = pyqtSignal(int)
-    phase_signal = pyqtSignal(dict)
     error_signal = pyqtSignal(str)
     
     def __init__(self, arduino, pattern_loader):
@@ -32,6 +44,11 @@ class AttackOrchestrator(QThread):
         
         self.current_cycle = 0
         self.attack_queue = []
+        self._jitter_pool = []
+        # Executed phases for the GUI to poll; no per-phase cross-thread signal
+        self._pending_phases = collections.deque(maxlen=256)
+        # pattern name -> (pattern dict, [(group, intensity, duration), ...])
+        self._template_cache = {}
     
     def engage_safety(self):
         self.safety_engaged = True
@@ -83,25 +100,17 @@ class AttackOrchestrator(QThread):
         
         while self.running:
             # Process config updates
-            try:
-                while True:
-                    new_config = self.config_queue.get_nowait()
-                    self.config.update(new_config)
-                    self.build_attack_queue()
-                    self.status_signal.emit("Config updated")
-            except queue.Empty:
-                pass
+            for new_config in self._drain(self.config_queue):
+                self.config.update(new_config)
+                self.build_attack_queue()
+                self.status_signal.emit("Config updated")
             
             # Process pattern changes
-            try:
-                while True:
-                    pattern_name = self.pattern_queue.get_nowait()
-                    if self.patterns.get_pattern(pattern_name):
-                        self.config["pattern_name"] = pattern_name
-                        self.build_attack_queue()
-                        self.status_signal.emit(f"Pattern: {pattern_name}")
-            except queue.Empty:
-                pass
+            for pattern_name in self._drain(self.pattern_queue):
+                if self.patterns.get_pattern(pattern_name):
+                    self.config["pattern_name"] = pattern_name
+                    self.build_attack_queue()
+                    self.status_signal.emit(f"Pattern: {pattern_name}")
             
             # Check safety
             if not self.safety_engaged:
@@ -110,17 +119,13 @@ class AttackOrchestrator(QThread):
                 break
             
             # Execute attack queue
-            for attack in self.attack_queue:
+            for idx, attack in enumerate(self.attack_queue):
                 if not self.running:
                     break
                 
                 self.execute_attack(attack)
                 
-                jitter = random.uniform(
-                    1 - self.config["jitter_range"],
-                    1 + self.config["jitter_range"]
-                )
-                sleep_time = attack["duration"] / 1000 * jitter
+                sleep_time = attack.duration / 1000 * self._jitter_pool[idx]
                 time.sleep(sleep_time)
                 
                 time.sleep(0.5)
@@ -140,33 +145,62 @@ class AttackOrchestrator(QThread):
         self.status_signal.emit("ORCHESTRATOR STOPPED")
         self.logger.log("ORCHESTRATOR_STOP", {})
     
+    @staticmethod
+    def _drain(q: queue.Queue) -> list:
+        """Take everything queued in one swap under the queue's lock, no Empty raised"""
+        with q.mutex:
+            pending = list(q.queue)
+            q.queue.clear()
+            q.not_full.notify_all()
+        return pending
+    
     def build_attack_queue(self):
         pattern = self.patterns.get_pattern(self.config["pattern_name"])
         if not pattern:
             self.error_signal.emit(f"Pattern not found: {self.config['pattern_name']}")
             return
         
-        self.attack_queue = []
-        for target in self.config["targets"]:
-            for repeat in range(pattern.get("repeat", 1)):
-                for phase in pattern["sequence"]:
-                    self.attack_queue.append({
-                        "target": target,
-                        "group": phase["group"],
-                        "intensity": phase["intensity"],
-                        "duration": phase.get("duration_ms", 1000),
-                        "name": f"{target}_{pattern['name']}"
-                    })
+        template = self._attack_template(self.config["pattern_name"], pattern)
+        ordered = [
+            Attack(target, group, intensity, duration, name)
+            for target, name in ((t, f"{t}_{pattern['name']}") for t in self.config["targets"])
+            for group, intensity, duration in template
+        ]
+        self.attack_queue = [ordered[i] for i in _rng.permutation(len(ordered)).tolist()]
         
-        random.shuffle(self.attack_queue)
+        # One jitter multiplier per queued attack, drawn in a single call
+        jitter = self.config["jitter_range"]
+        self._jitter_pool = _rng.uniform(1 - jitter, 1 + jitter, len(self.attack_queue)).tolist()
         self.status_signal.emit(f"Queue: {len(self.attack_queue)} attacks")
     
-    def execute_attack(self, attack: dict):
-        self.phase_signal.emit(attack)
-        self.status_signal.emit(f"[C{self.current_cycle}] {attack['name']}")
-        self.logger.log("PHASE_EXEC", attack)
+    def _attack_template(self, pattern_name: str, pattern: dict) -> list:
+        """Flattened (group, intensity, duration) phases for a pattern, built once per pattern"""
+        cached = self._template_cache.get(pattern_name)
+        if cached and cached[0] is pattern:
+            return cached[1]
+        
+        template = [
+            (phase["group"], phase["intensity"], phase.get("duration_ms", 1000))
+            for phase in pattern["sequence"]
+        ] * pattern.get("repeat", 1)
+        self._template_cache[pattern_name] = (pattern, template)
+        return template
+    
+    def execute_attack(self, attack: Attack):
+        # The GUI gets the immutable tuple itself; only the log needs a dict
+        self._pending_phases.append(attack)
+        self.logger.log("PHASE_EXEC", attack._asdict())
         
         self.arduino.send_command("SET_GROUP", {
-            "group": attack["group"],
-            "intensity": attack["intensity"]
+            "group": attack.group,
+            "intensity": attack.intensity
         })
+    
+    def take_phases(self) -> list:
+        """Attack tuples executed since the last call (called from the GUI thread)"""
+        phases = []
+        while True:
+            try:
+                phases.append(self._pending_phases.popleft())
+            except IndexError:
+                return phases
@@ -1,8 +1,24 @@
 import time
 import json
+import collections
 import serial
 from PyQt6.QtCore import QThread, pyqtSignal
 from utils.logger import SimpleLogger
+from utils.ports import set_low_latency
+
+# orjson is optional; it reads and writes bytes directly and is much faster than json
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except Exception:
+    orjson = None
+    _dumps = lambda obj: json.dumps(obj).encode()
+    _loads = lambda line: json.loads(line.decode())
+
+# Read timeout for the worker loop; send_command interrupts the read, so this
+# only bounds how long stop() and disconnect detection can take
+READ_TIMEOUT = 0.1
 
 class SerialWorker(QThread):
     data_received = pyqtSignal(dict)
@@ -15,12 +31,13 @@ class SerialWorker(QThread):
         self.baud_rate = baud_rate
         self.serial = None
         self.running = False
-        self.command_queue = []
+        # append/popleft on a deque are atomic, so the channel needs no lock
+        self.command_queue = collections.deque()
         self.logger = SimpleLogger("logs/serial.log")
     
     def run(self):
         try:
-            self.serial = serial.Serial(self.port, self.baud_rate, timeout=0.1)
+            self.serial = serial.Serial(self.port, self.baud_rate, timeout=READ_TIMEOUT)
             time.sleep(2)  # Arduino reset
             
             if not self.serial.is_open:
@@ -28,33 +45,50 @@ class SerialWorker(QThread):
                 return
             
             self.running = True
-            self.logger.log("SERIAL_OPEN", {"port": self.port, "baud": self.baud_rate})
+            low_latency = set_low_latency(self.serial)
+            self.logger.log("SERIAL_OPEN", {"port": self.port, "baud": self.baud_rate, "low_latency": low_latency})
             
+            pending = b""
             while self.running:
                 # Send queued commands
-                while self.command_queue:
-                    cmd = self.command_queue.pop(0)
-                    self.serial.write(json.dumps(cmd).encode() + b'\n')
-                    self.logger.log("SERIAL_WRITE", cmd)
-                
-                # Read responses
-                if self.serial.in_waiting:
+                while True:
                     try:
-                        line = self.serial.readline()
-                        if line:
-                            data = json.loads(line.decode().strip())
+                        cmd = self.command_queue.popleft()
+                    except IndexError:
+                        break
+                    if isinstance(cmd, bytes):
+                        # Pre-encoded line from send_raw
+                        self.serial.write(cmd)
+                        self.logger.log("SERIAL_WRITE", {"raw": cmd.decode(errors="replace").rstrip()})
+                    else:
+                        self.serial.write(_dumps(cmd) + b'\n')
+                        self.logger.log("SERIAL_WRITE", cmd)
+                
+                # Read responses: sleep in the driver until the first byte or the read
+                # timeout, then take everything already buffered in one call and frame
+                # lines in memory (read_until would fetch the rest a byte at a time)
+                chunk = self.serial.read(1)
+                if chunk:
+                    waiting = self.serial.in_waiting
+                    if waiting:
+                        chunk += self.serial.read(waiting)
+                    *lines, pending = (pending + chunk).split(b'\n')
+                    for line in lines:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            data = _loads(line)
                             self.data_received.emit(data)
                             self.logger.log("SERIAL_READ", data)
-                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                        self.error_occurred.emit(f"Parse error: {e}")
+                        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                            self.error_occurred.emit(f"Parse error: {e}")
                 
                 # Check disconnect
                 if not self.serial.is_open:
                     self.disconnected.emit()
                     break
                 
-                time.sleep(0.01)
-                
         except serial.SerialException as e:
             self.error_occurred.emit(f"Serial error: {e}")
         finally:
@@ -64,7 +98,23 @@ class SerialWorker(QThread):
     
     def send_command(self, cmd: dict):
         self.command_queue.append(cmd)
+        self._wake()
+    
+    def send_raw(self, line: bytes):
+        """Queue an already-encoded, newline-terminated line"""
+        self.command_queue.append(line)
+        self._wake()
     
     def stop(self):
         self.running = False
+        self._wake()
         self.wait()
+    
+    def _wake(self):
+        # Cut the worker's blocking read short so it acts now, not at the timeout
+        port = self.serial
+        if port is not None and port.is_open and hasattr(port, "cancel_read"):
+            try:
+                port.cancel_read()
+            except Exception:
+                pass
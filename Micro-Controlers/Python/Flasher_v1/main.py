@@ -8,28 +8,35 @@ import sys
 import os
 from pathlib import Path
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gui.main_window import MainWindow
+from gui.main_window import MainWindow, APP_STYLE
 
 def main():
-    # Create necessary directories
-    Path("logs").mkdir(exist_ok=True)
-    Path("firmware").mkdir(exist_ok=True)
-    Path("user_attacks").mkdir(exist_ok=True)
+    # Create necessary directories; one listing of "." replaces a mkdir per
+    # directory when they already exist
+    with os.scandir(".") as it:
+        existing = {entry.name for entry in it if entry.is_dir()}
+    for name in ("logs", "firmware", "user_attacks"):
+        if name not in existing:
+            os.makedirs(name, exist_ok=True)
     
     app = QApplication(sys.argv)
+    app.setStyleSheet(APP_STYLE)
     
     # Add tools to PATH if they exist locally
     if sys.platform != "win32":
-        tools_dir = Path("tools")
-        if tools_dir.exists():
-            os.environ["PATH"] = str(tools_dir.absolute()) + os.pathsep + os.environ["PATH"]
+        if "tools" in existing:
+            os.environ["PATH"] = str(Path("tools").absolute()) + os.pathsep + os.environ["PATH"]
     
     window = MainWindow()
     window.show()
+    # Auto-connect as soon as the event loop runs; the scan itself is off-thread,
+    # so it never delays the first paint
+    QTimer.singleShot(0, window.auto_connect)
     
     sys.exit(app.exec())
 
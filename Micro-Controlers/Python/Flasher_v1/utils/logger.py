@@ -1,33 +1,138 @@
 import time
 import json
 from pathlib import Path
-from PyQt6.QtCore import QObject
+from PyQt6.QtCore import (QObject, QThread, QTimer, QCoreApplication, QMetaObject,
+                          Qt, pyqtSignal, pyqtSlot)
 
-class SimpleLogger(QObject):
-    def __init__(self, log_file: str):
+# orjson is optional; it encodes straight to bytes and is much faster than json
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+def _dumps(entry: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(entry).encode()
+
+class _LogWriter(QObject):
+    """Owns one log file; lives on the shared writer thread"""
+    def __init__(self, log_file: Path, deferred_flush: bool):
         super().__init__()
-        self.log_file = Path(log_file)
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write session header
-        with open(self.log_file, "a") as f:
-            f.write(f"\n{'='*60}\n")
-            f.write(f"SESSION START: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"{'='*60}\n")
+        # Large buffer: entries collect in memory and reach the kernel once per burst
+        self._fh = open(log_file, "ab", buffering=65536)
+        self._deferred_flush = deferred_flush
+        self._flush_pending = False
+        # Entries carry integer microseconds since this reference instead of a float epoch
+        self._t0_ns = time.time_ns()
     
-    def log(self, event: str, data: dict):
-        """Log event with timestamp and JSON data"""
+    @pyqtSlot()
+    def write_header(self):
+        self._fh.write(f"\n{'='*60}\n".encode())
+        self._fh.write(f"SESSION START: {time.strftime('%Y-%m-%d %H:%M:%S')}\n".encode())
+        self._fh.write(f"session_start_ns: {self._t0_ns}\n".encode())
+        self._fh.write(f"{'='*60}\n".encode())
+        self._schedule_flush()
+    
+    @pyqtSlot(object, str, object)
+    def write(self, timestamp_ns: int, event: str, data):
         try:
             entry = {
-                "timestamp": time.time(),
+                "t_us": (timestamp_ns - self._t0_ns) // 1000,
                 "event": event,
                 "data": data
             }
-            with open(self.log_file, "a") as f:
-                f.write(json.dumps(entry) + "\n")
+            self._fh.write(_dumps(entry) + b"\n")
         except Exception as e:
             # Fail silently to avoid disrupting operations
             print(f"Logger error: {e}")
+        self._schedule_flush()
+    
+    def _schedule_flush(self):
+        # Flush once the queued burst has been written rather than per entry
+        if not self._deferred_flush:
+            self._flush()
+        elif not self._flush_pending:
+            self._flush_pending = True
+            QTimer.singleShot(0, self._flush)
+    
+    def _flush(self):
+        self._flush_pending = False
+        try:
+            self._fh.flush()
+        except Exception as e:
+            print(f"Logger error: {e}")
+    
+    @pyqtSlot()
+    def close(self):
+        if not self._fh.closed:
+            self._fh.flush()
+            self._fh.close()
+
+# One writer thread and one writer per file, shared by every SimpleLogger
+_writer_thread = None
+_writers = {}
+
+def _shared_writer_thread():
+    global _writer_thread
+    app = QCoreApplication.instance()
+    if app is None:
+        # No event loop to hand entries to; loggers write on the caller's thread
+        return None
+    if _writer_thread is None:
+        _writer_thread = QThread()
+        _writer_thread.setObjectName("log-writer")
+        _writer_thread.start()
+        app.aboutToQuit.connect(shutdown_loggers)
+    return _writer_thread
+
+def shutdown_loggers():
+    """Write out everything queued, close all log files and stop the writer thread"""
+    global _writer_thread
+    for writer in _writers.values():
+        if _writer_thread is not None and writer.thread() is _writer_thread:
+            QMetaObject.invokeMethod(writer, "close", Qt.ConnectionType.BlockingQueuedConnection)
+        else:
+            writer.close()
+    _writers.clear()
+    if _writer_thread is not None:
+        _writer_thread.quit()
+        _writer_thread.wait()
+        _writer_thread = None
+
+class SimpleLogger(QObject):
+    _log_signal = pyqtSignal(object, str, object)
+    
+    def __init__(self, log_file: str):
+        super().__init__()
+        self.log_file = Path(log_file)
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Entries are handed to the writer thread through a queued connection,
+        # so log() never waits on disk I/O
+        key = self.log_file.resolve()
+        writer = _writers.get(key)
+        thread = _shared_writer_thread()
+        if writer is None:
+            writer = _LogWriter(self.log_file, deferred_flush=thread is not None)
+            if thread is not None:
+                writer.moveToThread(thread)
+            _writers[key] = writer
+        self._writer = writer
+        
+        connection = Qt.ConnectionType.QueuedConnection if thread is not None else Qt.ConnectionType.DirectConnection
+        self._log_signal.connect(writer.write, connection)
+        
+        # Write session header
+        QMetaObject.invokeMethod(writer, "write_header", connection)
+    
+    def log(self, event: str, data: dict):
+        """Log event with timestamp and JSON data"""
+        # Serialized later on the writer thread: snapshot the dict so callers
+        # that keep mutating it (e.g. a live config) log the values of this call
+        if type(data) is dict:
+            data = dict(data)
+        self._log_signal.emit(time.time_ns(), event, data)
 
 class NullLogger(QObject):
     """Logger that discards all messages (for testing)"""
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import serial.tools.list_ports
+
+# Port enumeration is slow on Windows (WMI/SetupDi), so results are shared
+# between callers for a couple of seconds
+_ports_cache = {"ts": 0.0, "val": ()}
+
+def cached_comports(ttl: float = 2.0) -> tuple:
+    """Return serial.tools.list_ports.comports(), re-enumerating at most every ttl seconds"""
+    now = time.monotonic()
+    if now - _ports_cache["ts"] >= ttl:
+        _ports_cache["val"] = tuple(serial.tools.list_ports.comports(include_links=False))
+        _ports_cache["ts"] = now
+    return _ports_cache["val"]
+
+def invalidate_comports():
+    """Force the next cached_comports() call to re-enumerate"""
+    _ports_cache["ts"] = 0.0
+
+# USB vendor IDs for each supported board, checked before description strings
+PLATFORM_VIDS = {
+    "ESP32": {0x10C4},
+    "PICO": {0x2E8A},
+    "ARDUINO": {0x2341, 0x2A03},
+    "STM32": {0x0483}
+}
+
+# Description substrings used when a port reports no recognised VID
+PLATFORM_DESCRIPTIONS = {
+    "ESP32": "CP210",
+    "PICO": "Pico",
+    "ARDUINO": "Arduino",
+    "STM32": "STM32"
+}
+
+# Inverted tables so detection is a single dict lookup per port
+_VID2PLAT = {vid: platform for platform, vids in PLATFORM_VIDS.items() for vid in vids}
+_DESC_KEYS = tuple((needle, platform) for platform, needle in PLATFORM_DESCRIPTIONS.items())
+
+def detect_platform(port) -> str:
+    """Detect microcontroller platform from USB VID/PID, falling back to the description"""
+    platform = _VID2PLAT.get(port.vid)
+    if platform:
+        return platform
+    description = port.description or ""
+    return next((platform for needle, platform in _DESC_KEYS if needle in description), "UNKNOWN")
+
+def find_platform_port(platform: str, ports=None):
+    """First port for platform: matching VIDs win before any description match"""
+    ports = cached_comports() if ports is None else ports
+    vids = PLATFORM_VIDS.get(platform, set())
+    for port in ports:
+        if port.vid in vids:
+            return port
+    needle = PLATFORM_DESCRIPTIONS.get(platform)
+    if needle:
+        for port in ports:
+            if needle in (port.description or ""):
+                return port
+    return None
+
+def set_low_latency(ser) -> bool:
+    """Best effort: ask the USB-serial driver to hand small packets up at once
+    instead of holding them for its 16 ms latency timer"""
+    ok = False
+    if hasattr(ser, "set_low_latency_mode"):
+        # POSIX pyserial: TIOCGSERIAL/TIOCSSERIAL with ASYNC_LOW_LATENCY
+        try:
+            ser.set_low_latency_mode(True)
+            ok = True
+        except (OSError, ValueError, NotImplementedError):
+            # macOS/BSD: pyserial only implements it on Linux
+            pass
+    if sys.platform.startswith("linux"):
+        # FTDI exposes its timer in sysfs; usually needs udev rules or root
+        name = os.path.basename(os.path.realpath(ser.port))
+        try:
+            with open(f"/sys/bus/usb-serial/devices/{name}/latency_timer", "w") as fh:
+                fh.write("1")
+            ok = True
+        except OSError:
+            pass
+    return ok
@@ -1,3 +1,8 @@
+# Keys every pattern phase must carry
+_PHASE_KEYS = ("group", "intensity", "duration_ms")
+
+# Numeric fields are checked with `type(x) is int` rather than isinstance: it is
+# cheaper in the per-phase loop and deliberately rejects bool (True is not a duration)
 def validate_config(config: dict) -> tuple[bool, str]:
     """
     Validate configuration dictionary before sending to microcontroller
@@ -8,28 +13,29 @@ def validate_config(config: dict) -> tuple[bool, str]:
     try:
         # Validate camera duration
         if "camera_duration" in config:
-            if not isinstance(config["camera_duration"], int):
+            if type(config["camera_duration"]) is not int:
                 return False, "camera_duration must be integer"
             if not (1000 <= config["camera_duration"] <= 60000):
                 return False, "camera_duration must be 1000-60000ms"
         
         # Validate data injection duration
         if "injection_duration" in config:
-            if not isinstance(config["injection_duration"], int):
+            if type(config["injection_duration"]) is not int:
                 return False, "injection_duration must be integer"
             if not (500 <= config["injection_duration"] <= 30000):
                 return False, "injection_duration must be 500-30000ms"
         
         # Validate jitter range
         if "jitter_range" in config:
-            if not isinstance(config["jitter_range"], (int, float)):
+            jitter_type = type(config["jitter_range"])
+            if jitter_type is not int and jitter_type is not float:
                 return False, "jitter_range must be number"
             if not (0.0 <= config["jitter_range"] <= 0.5):
                 return False, "jitter_range must be 0.0-0.5"
         
         # Validate max cycles
         if "max_cycles" in config:
-            if not isinstance(config["max_cycles"], int):
+            if type(config["max_cycles"]) is not int:
                 return False, "max_cycles must be integer"
             if not (1 <= config["max_cycles"] <= 9999):
                 return False, "max_cycles must be 1-9999"
@@ -78,25 +84,30 @@ def validate_pattern(pattern: dict) -> tuple[bool, str]:
         if len(pattern["sequence"]) > 100:
             return False, "sequence too long (max 100 phases)"
         
+        # Top-level repeat is cheap to check, so reject on it before walking phases.
+        # 0 is allowed: the bundled Deadly_Defaults patterns use it
+        if "repeat" in pattern:
+            if type(pattern["repeat"]) is not int or not (0 <= pattern["repeat"] <= 100):
+                return False, "repeat must be 0-100"
+        
         for i, phase in enumerate(pattern["sequence"]):
-            required_keys = ["group", "intensity", "duration_ms"]
-            for key in required_keys:
-                if key not in phase:
-                    return False, f"Phase {i} missing key: {key}"
+            # One lookup per key instead of an `in` test followed by indexing
+            group = phase.get("group")
+            intensity = phase.get("intensity")
+            duration = phase.get("duration_ms")
+            if group is None or intensity is None or duration is None:
+                missing = next(k for k, v in zip(_PHASE_KEYS, (group, intensity, duration)) if v is None)
+                return False, f"Phase {i} missing key: {missing}"
             
-            if not isinstance(phase["group"], int) or not (0 <= phase["group"] <= 5):
+            if type(group) is not int or not (0 <= group <= 5):
                 return False, f"Phase {i} group must be 0-5"
             
-            if not isinstance(phase["intensity"], int) or not (0 <= phase["intensity"] <= 255):
+            if type(intensity) is not int or not (0 <= intensity <= 255):
                 return False, f"Phase {i} intensity must be 0-255"
             
-            if not isinstance(phase["duration_ms"], int) or not (1 <= phase["duration_ms"] <= 60000):
+            if type(duration) is not int or not (1 <= duration <= 60000):
                 return False, f"Phase {i} duration_ms must be 1-60000"
         
-        if "repeat" in pattern:
-            if not isinstance(pattern["repeat"], int) or not (1 <= pattern["repeat"] <= 100):
-                return False, "repeat must be 1-100"
-        
         return True, ""
     
     except Exception as e:
@@ -14,7 +14,7 @@ A self-contained pattern generator toolbox.
 - Extra blend modes: overlay, exclusion (custom pixel ops; NumPy accelerated when available)
 - Extra generators: spirals, voronoi, flowfield
 
-Dependencies: pillow, reportlab, (optional) numpy
+Dependencies: pillow, reportlab, (optional) numpy, (optional) numba, (optional) PyTurboJPEG or simplejpeg
 """
 
 import os
@@ -23,19 +23,38 @@ import math
 import time
 import random
 import datetime
-from dataclasses import dataclass
+import operator
+import threading
+import subprocess
+from collections import deque
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from typing import List, Dict, Tuple, Optional
 
 from PIL import Image, ImageDraw, ImageChops, ImageFont, ImageFilter
-from reportlab.pdfgen import canvas as rl_canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.utils import ImageReader
 
 try:
     import numpy as np  # optional
 except Exception:
     np = None
 
+try:
+    import numba as nb  # optional; fuses the overlay/exclusion kernels
+except Exception:
+    nb = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420  # optional; libjpeg-turbo encoder for PDF embeds
+    _tj = TurboJPEG()
+except Exception:
+    _tj = None
+
+try:
+    import simplejpeg  # optional; second libjpeg-turbo binding, used when PyTurboJPEG is missing
+except Exception:
+    simplejpeg = None
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
@@ -50,28 +69,20 @@ except Exception:
 def _clamp255(x: float) -> int:
     return int(max(0, min(255, x)))
 
+# For each 60-degree sector: which of (c, x, 0) lands in r, g and b
+_HSL_SECTORS = ((0,1,2), (1,0,2), (2,0,1), (2,1,0), (1,2,0), (0,2,1))
+
 def hsl_to_rgb(h: float, s: float, l: float) -> Tuple[int,int,int]:
     """HSL (h in degrees, s/l in 0..1) -> RGB 0..255."""
     h = h % 360.0
     c = (1 - abs(2*l - 1)) * s
     hp = h / 60.0
     x = c * (1 - abs((hp % 2) - 1))
-    r1 = g1 = b1 = 0.0
-    if 0 <= hp < 1:
-        r1,g1,b1 = c,x,0
-    elif 1 <= hp < 2:
-        r1,g1,b1 = x,c,0
-    elif 2 <= hp < 3:
-        r1,g1,b1 = 0,c,x
-    elif 3 <= hp < 4:
-        r1,g1,b1 = 0,x,c
-    elif 4 <= hp < 5:
-        r1,g1,b1 = x,0,c
-    else:
-        r1,g1,b1 = c,0,x
     m = l - c/2
-    return (_clamp255((r1+m)*255), _clamp255((g1+m)*255), _clamp255((b1+m)*255))
-
+    # Channel values with m added up front; one table lookup replaces the sector if-chain
+    vals = (c + m, x + m, m)
+    ri, gi, bi = _HSL_SECTORS[min(int(hp), 5)]
+    return (_clamp255(vals[ri]*255), _clamp255(vals[gi]*255), _clamp255(vals[bi]*255))
 
 PALETTES = [
     "random", "highcontrast", "subtle", "earthtones", "psychedelic", "neon", "thermal"
@@ -81,52 +92,144 @@ BLEND_MODES = [
     "source-over", "multiply", "screen", "difference", "lighter", "overlay", "exclusion"
 ]
 
-def pick_color(rng: random.Random, is_color: bool, palette: str, alpha: int = 255) -> Tuple[int,int,int,int]:
+def color_picker(rng: random.Random, is_color: bool, palette: str):
+    """
+    pick_color with the palette dispatch done once: returns pick(alpha) for use in
+    generator loops. Draws from rng exactly as pick_color does.
+    """
+    rnd = rng.random
     if not is_color:
-        g = rng.randrange(256)
-        return (g, g, g, alpha)
+        randrange = rng.randrange
+        def pick(alpha: int = 255) -> Tuple[int,int,int,int]:
+            g = randrange(256)
+            return (g, g, g, alpha)
+        return pick
 
     p = (palette or "random").lower()
     if p == "highcontrast":
-        return (0,0,0,alpha) if rng.random() > 0.5 else (255,255,255,alpha)
+        return lambda alpha=255: (0,0,0,alpha) if rnd() > 0.5 else (255,255,255,alpha)
     if p == "subtle":
-        s = rng.randrange(80, 181)
-        return (s, s, s, alpha)
+        randrange = rng.randrange
+        def pick(alpha: int = 255) -> Tuple[int,int,int,int]:
+            s = randrange(80, 181)
+            return (s, s, s, alpha)
+        return pick
     if p == "earthtones":
-        h = 20 + rng.random() * 60
-        sat = (30 + rng.random() * 50) / 100.0
-        lig = (20 + rng.random() * 45) / 100.0
-        r,g,b = hsl_to_rgb(h, sat, lig)
-        return (r,g,b,alpha)
+        def pick(alpha: int = 255) -> Tuple[int,int,int,int]:
+            h = 20 + rnd() * 60
+            sat = (30 + rnd() * 50) / 100.0
+            lig = (20 + rnd() * 45) / 100.0
+            return hsl_to_rgb(h, sat, lig) + (alpha,)
+        return pick
     if p == "psychedelic":
-        r,g,b = hsl_to_rgb(rng.random() * 360, 1.0, 0.5)
-        return (r,g,b,alpha)
+        return lambda alpha=255: hsl_to_rgb(rnd() * 360, 1.0, 0.5) + (alpha,)
     if p == "neon":
-        r,g,b = hsl_to_rgb(180 + rng.random() * 180, 1.0, 0.6)
-        return (r,g,b,alpha)
+        return lambda alpha=255: hsl_to_rgb(180 + rnd() * 180, 1.0, 0.6) + (alpha,)
     if p == "thermal":
-        t = rng.random()
-        return (255,0,255,alpha) if t < 0.33 else (255,255,255,alpha) if t < 0.66 else (0,0,255,alpha)
-
-    r,g,b = hsl_to_rgb(rng.random() * 360, 0.8, 0.6)
-    return (r,g,b,alpha)
-
-
-def _overlay_channel(b: "np.ndarray", t: "np.ndarray") -> "np.ndarray":
-    # b,t uint8 arrays
-    b_f = b.astype(np.float32)
-    t_f = t.astype(np.float32)
-    mask = b_f < 128.0
-    out = np.empty_like(b_f)
-    out[mask] = 2.0 * b_f[mask] * t_f[mask] / 255.0
-    out[~mask] = 255.0 - 2.0 * (255.0 - b_f[~mask]) * (255.0 - t_f[~mask]) / 255.0
-    return np.clip(out, 0, 255).astype(np.uint8)
-
-def _exclusion_channel(b: "np.ndarray", t: "np.ndarray") -> "np.ndarray":
-    b_f = b.astype(np.float32)
-    t_f = t.astype(np.float32)
+        def pick(alpha: int = 255) -> Tuple[int,int,int,int]:
+            t = rnd()
+            return (255,0,255,alpha) if t < 0.33 else (255,255,255,alpha) if t < 0.66 else (0,0,255,alpha)
+        return pick
+
+    return lambda alpha=255: hsl_to_rgb(rnd() * 360, 0.8, 0.6) + (alpha,)
+
+def pick_color(rng: random.Random, is_color: bool, palette: str, alpha: int = 255) -> Tuple[int,int,int,int]:
+    return color_picker(rng, is_color, palette)(alpha)
+
+
+def _overlay_rgb(b_f: "np.ndarray", t_f: "np.ndarray") -> "np.ndarray":
+    # b_f,t_f float32 (H,W,3); result keeps the old uint8 quantisation but stays float32
+    out = np.where(b_f < 128.0,
+                   2.0 * b_f * t_f / 255.0,
+                   255.0 - 2.0 * (255.0 - b_f) * (255.0 - t_f) / 255.0).astype(np.float32, copy=False)
+    np.clip(out, 0, 255, out=out)
+    return np.floor(out, out=out)
+
+def _exclusion_rgb(b_f: "np.ndarray", t_f: "np.ndarray") -> "np.ndarray":
     out = b_f + t_f - 2.0 * b_f * t_f / 255.0
-    return np.clip(out, 0, 255).astype(np.uint8)
+    np.clip(out, 0, 255, out=out)
+    return np.floor(out, out=out)
+
+if np is not None and nb is not None:
+    @nb.njit(cache=True)
+    def _blend_fused(b, t, out, overlay):
+        # One read and one write per pixel: blend op, quantise and composite together.
+        # Mirrors _overlay_rgb/_exclusion_rgb + _composite_top_alpha step for step in
+        # float32 (no fastmath), so output is identical with or without numba.
+        # Serial on purpose: the export pool forks, and a parent that has already
+        # started numba's OpenMP/TBB threads crashes or hangs its forked workers
+        f32 = np.float32
+        one, two, c255 = f32(1.0), f32(2.0), f32(255.0)
+        H, W = b.shape[0], b.shape[1]
+        for y in range(H):
+            for x in range(W):
+                ta = f32(t[y, x, 3]) / c255
+                ba = f32(b[y, x, 3]) / c255
+                inv_ta = one - ta
+                oa = ta + ba * inv_ta
+                oa_safe = one if oa <= f32(1e-6) else oa
+                for c in range(3):
+                    bc = f32(b[y, x, c])
+                    tc = f32(t[y, x, c])
+                    if overlay:
+                        if bc < f32(128.0):
+                            v = two * bc * tc / c255
+                        else:
+                            v = c255 - two * (c255 - bc) * (c255 - tc) / c255
+                    else:
+                        v = bc + tc - two * bc * tc / c255
+                    v = f32(math.floor(min(max(v, f32(0.0)), c255)))
+                    v = (v * ta + bc * ba * inv_ta) / oa_safe
+                    out[y, x, c] = int(min(max(v, f32(0.0)), c255))
+                out[y, x, 3] = int(min(max(oa * c255, f32(0.0)), c255))
+        return out
+else:
+    _blend_fused = None
+
+def _chops_rgb(mode: str, b: "np.ndarray", t: "np.ndarray") -> "np.ndarray":
+    # Same integer results as the ImageChops ops (truncating /255), as float32
+    if mode == "multiply":
+        out = b.astype(np.uint16) * t // 255
+    elif mode == "screen":
+        out = 255 - (255 - b.astype(np.uint16)) * (255 - t) // 255
+    elif mode == "difference":
+        out = np.abs(b.astype(np.int16) - t)
+    else:
+        out = np.maximum(b, t)
+    return out.astype(np.float32)
+
+def _composite_top_alpha(b: "np.ndarray", b_f: "np.ndarray", t: "np.ndarray", mixed: "np.ndarray") -> "np.ndarray":
+    """Composite blended RGB over b with t's alpha; mixed and b_f are overwritten."""
+    ta = t[..., 3:4].astype(np.float32) / 255.0
+    ba = b[..., 3:4].astype(np.float32) / 255.0
+    inv_ta = 1.0 - ta
+    oa = ta + ba * inv_ta
+    oa_safe = np.where(oa <= 1e-6, 1.0, oa)
+
+    mixed *= ta
+    b_f *= ba
+    b_f *= inv_ta
+    mixed += b_f
+    mixed /= oa_safe
+    np.clip(mixed, 0, 255, out=mixed)
+
+    out = np.empty_like(b)
+    out[..., :3] = mixed
+    out[..., 3:4] = np.clip(oa * 255.0, 0, 255)
+    return out
+
+# Layer opacities repeat across designs, so their alpha-scaling tables are kept
+_ALPHA_LUTS: Dict[float, List[int]] = {}
+
+def _alpha_lut(alpha: float) -> List[int]:
+    lut = _ALPHA_LUTS.get(alpha)
+    if lut is None:
+        if len(_ALPHA_LUTS) >= 64:
+            _ALPHA_LUTS.clear()
+        lut = _ALPHA_LUTS[alpha] = [int(p * alpha) for p in range(256)]
+    return lut
+
+_NUMPY_MODES = ("multiply", "screen", "difference", "lighter", "overlay", "exclusion")
 
 def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float) -> Image.Image:
     """
@@ -142,14 +245,30 @@ def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float) ->
         top = top.convert("RGBA")
 
     if alpha < 1.0:
-        a = top.split()[-1].point(lambda p: int(p * alpha))
-        top = top.copy()
-        top.putalpha(a)
+        r, g, b, a = top.split()
+        top = Image.merge("RGBA", (r, g, b, a.point(_alpha_lut(alpha))))
 
     m = (mode or "source-over").lower()
     if m == "source-over":
         return Image.alpha_composite(base, top)
 
+    # With NumPy every custom mode is one blend expression plus one composite pass
+    if np is not None and m in _NUMPY_MODES:
+        b = np.asarray(base, dtype=np.uint8)
+        t = np.asarray(top, dtype=np.uint8)
+        if m in ("overlay", "exclusion") and _blend_fused is not None:
+            return Image.fromarray(_blend_fused(b, t, np.empty_like(b), m == "overlay"), mode="RGBA")
+
+        # All three channels in one pass each, broadcasting alpha over the last axis
+        b_f = b[..., :3].astype(np.float32)
+        if m == "overlay":
+            mixed = _overlay_rgb(b_f, t[..., :3].astype(np.float32))
+        elif m == "exclusion":
+            mixed = _exclusion_rgb(b_f, t[..., :3].astype(np.float32))
+        else:
+            mixed = _chops_rgb(m, b[..., :3], t[..., :3])
+        return Image.fromarray(_composite_top_alpha(b, b_f, t, mixed), mode="RGBA")
+
     # Simple modes via ImageChops on RGB; alpha from top
     if m in ("multiply", "screen", "difference", "lighter"):
         rgbb = base.convert("RGB")
@@ -167,33 +286,6 @@ def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float) ->
         return Image.alpha_composite(base, mixed)
 
     if m in ("overlay", "exclusion"):
-        # Custom ops; best with NumPy.
-        if np is not None:
-            b = np.array(base.convert("RGBA"), dtype=np.uint8)
-            t = np.array(top.convert("RGBA"), dtype=np.uint8)
-            out = b.copy()
-
-            if m == "overlay":
-                out[..., 0] = _overlay_channel(b[..., 0], t[..., 0])
-                out[..., 1] = _overlay_channel(b[..., 1], t[..., 1])
-                out[..., 2] = _overlay_channel(b[..., 2], t[..., 2])
-            else:
-                out[..., 0] = _exclusion_channel(b[..., 0], t[..., 0])
-                out[..., 1] = _exclusion_channel(b[..., 1], t[..., 1])
-                out[..., 2] = _exclusion_channel(b[..., 2], t[..., 2])
-
-            # Alpha composite using top alpha
-            ta = t[..., 3].astype(np.float32) / 255.0
-            ba = b[..., 3].astype(np.float32) / 255.0
-            oa = ta + ba * (1.0 - ta)
-            oa_safe = np.where(oa <= 1e-6, 1.0, oa)
-
-            for ch in (0,1,2):
-                out[..., ch] = np.clip((out[..., ch].astype(np.float32) * ta + b[..., ch].astype(np.float32) * ba * (1.0 - ta)) / oa_safe, 0, 255).astype(np.uint8)
-            out[..., 3] = np.clip(oa * 255.0, 0, 255).astype(np.uint8)
-
-            return Image.fromarray(out, mode="RGBA")
-
         # Fallback (no NumPy): do the op on a smaller working resolution if large
         W, H = base.size
         work = 0.5 if (W * H) > 800_000 else 1.0
@@ -201,12 +293,11 @@ def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float) ->
             w2, h2 = int(W * work), int(H * work)
             b_small = base.resize((w2,h2), Image.BILINEAR)
             t_small = top.resize((w2,h2), Image.BILINEAR)
-            blended_small = blend_layer(b_small, t_small, m, 1.0)  # recursion hits NumPy case? no; work==1 in small
-            # above recursion loops; avoid recursion by manual per-pixel:
             base2 = b_small.convert("RGBA")
             top2 = t_small.convert("RGBA")
             out = _blend_overlay_exclusion_pure(base2, top2, m)
-            out = out.resize((W,H), Image.BILINEAR)
+            # Upscale back: no filter needed, the downscale above already smoothed it
+            out = out.resize((W,H), Image.NEAREST)
             out.putalpha(Image.alpha_composite(base, top).split()[-1])
             return out
 
@@ -215,6 +306,21 @@ def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float) ->
     return Image.alpha_composite(base, top)
 
 
+# 256x256 lookup tables for the pure path, indexed [base*256 + top]; built on first use
+_BLEND_LUTS: Dict[str, bytes] = {}
+_LUT_ROW = [v << 8 for v in range(256)]
+
+def _blend_lut(mode: str) -> bytes:
+    lut = _BLEND_LUTS.get(mode)
+    if lut is None:
+        if mode == "overlay":
+            f = lambda bc, tc: int((2*bc*tc/255) if bc < 128 else (255 - 2*(255-bc)*(255-tc)/255))
+        else:
+            f = lambda bc, tc: int(bc + tc - 2*bc*tc/255)
+        lut = bytes(_clamp255(f(bc, tc)) for bc in range(256) for tc in range(256))
+        _BLEND_LUTS[mode] = lut
+    return lut
+
 def _blend_overlay_exclusion_pure(base: Image.Image, top: Image.Image, mode: str) -> Image.Image:
     """Pure-PIL fallback for overlay/exclusion. Slower; used for small images or downscaled work."""
     b = base.convert("RGBA")
@@ -222,30 +328,18 @@ def _blend_overlay_exclusion_pure(base: Image.Image, top: Image.Image, mode: str
     W, H = b.size
     bpx = b.tobytes()
     tpx = t.tobytes()
-    out = bytearray(len(bpx))
+    lut = _blend_lut(mode)
 
-    def overlay(bc, tc):
-        return int((2*bc*tc/255) if bc < 128 else (255 - 2*(255-bc)*(255-tc)/255))
+    # Per channel: slice out the planes and map them through the table; map() over
+    # builtins keeps the per-pixel work out of the bytecode loop
+    planes = []
+    for c in range(3):
+        idx = map(operator.add, map(_LUT_ROW.__getitem__, bpx[c::4]), tpx[c::4])
+        planes.append(Image.frombytes("L", (W, H), bytes(map(lut.__getitem__, idx))))
+    planes.append(t.getchannel("A"))
 
-    def exclusion(bc, tc):
-        return int(bc + tc - 2*bc*tc/255)
-
-    f = overlay if mode == "overlay" else exclusion
-
-    for i in range(0, len(bpx), 4):
-        br, bg, bb, ba = bpx[i], bpx[i+1], bpx[i+2], bpx[i+3]
-        tr, tg, tb, ta = tpx[i], tpx[i+1], tpx[i+2], tpx[i+3]
-        # apply op
-        rr = _clamp255(f(br, tr))
-        gg = _clamp255(f(bg, tg))
-        bb2 = _clamp255(f(bb, tb))
-        # alpha composite with top alpha
-        a = ta / 255.0
-        out[i]   = _clamp255(rr * a + br * (1-a))
-        out[i+1] = _clamp255(gg * a + bg * (1-a))
-        out[i+2] = _clamp255(bb2 * a + bb * (1-a))
-        out[i+3] = _clamp255(255*(a + (ba/255.0)*(1-a)))
-    return Image.frombytes("RGBA", (W,H), bytes(out))
+    # Composite with top alpha the same way the ImageChops modes do
+    return Image.alpha_composite(b, Image.merge("RGBA", planes))
 
 
 # ------------------ pattern generators ------------------
@@ -254,11 +348,16 @@ def pat_lines(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:flo
     img = Image.new("RGBA", (W,H), (0,0,0,0))
     d = ImageDraw.Draw(img)
     count = int(60 + comp * 220)
+    # Hoisted out of the loop: palette dispatch and bound-method lookups
+    pick = color_picker(rng, is_color, pal)
+    rnd = rng.random
+    line = d.line
+    wspan = 1 + 6*comp
     for _ in range(count):
-        d.line(
-            (rng.random()*W, rng.random()*H, rng.random()*W, rng.random()*H),
-            fill=pick_color(rng, is_color, pal, alpha=255),
-            width=max(1, int(1 + rng.random()*(1 + 6*comp)))
+        line(
+            (rnd()*W, rnd()*H, rnd()*W, rnd()*H),
+            fill=pick(255),
+            width=max(1, int(1 + rnd()*wspan))
         )
     return img
 
@@ -266,24 +365,36 @@ def pat_circles(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:f
     img = Image.new("RGBA", (W,H), (0,0,0,0))
     d = ImageDraw.Draw(img, "RGBA")
     count = int(25 + comp * 95)
+    pick = color_picker(rng, is_color, pal)
+    rnd = rng.random
+    ellipse = d.ellipse
+    rspan = 18 + 120*comp
+    aspan = 110 + 70*comp
     for _ in range(count):
-        cx, cy = rng.random()*W, rng.random()*H
-        r = 8 + rng.random()*(18 + 120*comp)
-        fill = pick_color(rng, is_color, pal, alpha=int(50 + rng.random()*(110 + 70*comp)))
-        outline = pick_color(rng, is_color, pal, alpha=255)
-        d.ellipse((cx-r, cy-r, cx+r, cy+r), fill=fill, outline=outline, width=1)
+        cx, cy = rnd()*W, rnd()*H
+        r = 8 + rnd()*rspan
+        fill = pick(int(50 + rnd()*aspan))
+        outline = pick(255)
+        ellipse((cx-r, cy-r, cx+r, cy+r), fill=fill, outline=outline, width=1)
     return img
 
 def pat_grid(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:float) -> Image.Image:
     img = Image.new("RGBA", (W,H), (0,0,0,0))
     d = ImageDraw.Draw(img)
     gs = int(10 + comp * 34)
-    for i in range(gs):
-        for j in range(gs):
-            x = (i/(gs-1))*W + (rng.random()*18 - 9)
-            y = (j/(gs-1))*H + (rng.random()*18 - 9)
-            rr = 2 + rng.random()*(2 + 10*comp)
-            d.ellipse((x-rr, y-rr, x+rr, y+rr), fill=pick_color(rng, is_color, pal, 255))
+    pick = color_picker(rng, is_color, pal)
+    rnd = rng.random
+    ellipse = d.ellipse
+    rspan = 2 + 10*comp
+    # Grid positions are the same for every row/column, so compute them once
+    gx = [(i/(gs-1))*W for i in range(gs)]
+    gy = [(j/(gs-1))*H for j in range(gs)]
+    for x0 in gx:
+        for y0 in gy:
+            x = x0 + (rnd()*18 - 9)
+            y = y0 + (rnd()*18 - 9)
+            rr = 2 + rnd()*rspan
+            ellipse((x-rr, y-rr, x+rr, y+rr), fill=pick(255))
     return img
 
 def pat_moire(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:float) -> Image.Image:
@@ -292,10 +403,19 @@ def pat_moire(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:flo
     cx = W/2 + (rng.random()*90 - 45)
     cy = H/2 + (rng.random()*90 - 45)
     step = 3 + (1-comp)*9
+    # ring radii (accumulated exactly as the old while-loop did) and their
+    # colours are drawn up front; only the ellipse calls stay in the loop
+    limit = min(W,H)/2
+    radii = []
     r = 6.0
-    while r < min(W,H)/2:
-        d.ellipse((cx-r, cy-r, cx+r, cy+r), outline=pick_color(rng, is_color, pal, 255), width=1)
+    while r < limit:
+        radii.append(r)
         r += step
+    pick = color_picker(rng, is_color, pal)
+    colors = [pick(255) for _ in radii]
+    ellipse = d.ellipse
+    for r, col in zip(radii, colors):
+        ellipse((cx-r, cy-r, cx+r, cy+r), outline=col, width=1)
     return img
 
 def pat_dazzle(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:float) -> Image.Image:
@@ -324,13 +444,17 @@ def pat_zebra(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:flo
     return img
 
 def pat_checker(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:float) -> Image.Image:
-    img = Image.new("RGBA", (W,H), (0,0,0,0))
-    d = ImageDraw.Draw(img)
     size = int(18 + (1-comp)*46)
-    for y in range(0, H, size):
-        for x in range(0, W, size):
-            gray = 150 if ((x//size + y//size) % 2 == 0) else 95
-            d.rectangle((x,y,x+size,y+size), fill=(gray,gray,gray,255))
+    # Build the board as bytes: two band rows (starting light / dark) repeated
+    # down the image, instead of one rectangle call per cell
+    light, dark = bytes((150,150,150,255)) * size, bytes((95,95,95,255)) * size
+    cells = (W + size - 1) // size + 1
+    row_a = ((light + dark) * (cells//2 + 1))[:W*4]
+    row_b = ((dark + light) * (cells//2 + 1))[:W*4]
+    bands = (row_a * size, row_b * size)
+    data = b"".join(bands[k % 2] for k in range((H + size - 1) // size))[:W*H*4]
+    img = Image.frombytes("RGBA", (W,H), data)
+    d = ImageDraw.Draw(img)
     # shadow-ish block
     d.rectangle((size*2, size, W-size*2, H-size), fill=(0,0,0,int(40+comp*150)))
     # ellipse pop
@@ -341,19 +465,41 @@ def pat_glitchgrid(rng: random.Random, W:int, H:int, is_color:bool, pal:str, com
     img = Image.new("RGBA", (W,H), (0,0,0,0))
     d = ImageDraw.Draw(img)
     block = int(14 + comp*38)
+    pick = color_picker(rng, is_color, pal)
+    pick_hc = color_picker(rng, is_color, "highcontrast")
+    rnd = rng.random
+    rectangle = d.rectangle
+    a = int(90 + comp*150)
+    jitter = block*comp
+    # fills and outlines must interleave: each cell's fill covers its neighbours' outlines
     for y in range(0, H, block):
         for x in range(0, W, block):
-            col = pick_color(rng, is_color, pal, 255)
-            a = int(90 + comp*150)
-            dx = int((rng.random()-0.5)*block*comp)
-            dy = int((rng.random()-0.5)*block*comp)
-            d.rectangle((x+dx, y+dy, x+dx+block, y+dy+block), fill=(col[0],col[1],col[2],a))
-            hc = pick_color(rng, is_color, "highcontrast", 255)
-            d.rectangle((x, y, x+block, y+block), outline=hc, width=1)
+            col = pick(a)
+            dx = int((rnd()-0.5)*jitter)
+            dy = int((rnd()-0.5)*jitter)
+            rectangle((x+dx, y+dy, x+dx+block, y+dy+block), fill=col)
+            rectangle((x, y, x+block, y+block), outline=pick_hc(255), width=1)
     return img
 
-def pat_noise(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:float) -> Image.Image:
-    """Fast noise; NumPy accelerated when available."""
+def pat_noise(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:float,
+              atlas: Optional["np.ndarray"] = None) -> Image.Image:
+    """Fast noise; NumPy accelerated when available. An optional (>=H, >=W, 3) uint8
+    atlas is windowed at a random offset instead of synthesizing fresh noise."""
+    if np is not None and atlas is not None:
+        oy = rng.randrange(atlas.shape[0] - H + 1)
+        ox = rng.randrange(atlas.shape[1] - W + 1)
+        window = atlas[oy:oy+H, ox:ox+W]
+        if is_color:
+            gen = np.random.default_rng(rng.randrange(1, 2_000_000_000))
+            strength = int(18 + comp*90)
+            arr = window.astype(np.int16)
+            arr += gen.integers(-strength, strength+1, size=arr.shape, dtype=np.int16)
+            img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8), mode="RGB").convert("RGBA")
+        else:
+            img = Image.fromarray(np.ascontiguousarray(window[..., 0]), mode="L").convert("RGBA")
+        img.putalpha(255)
+        return img
+
     if np is not None:
         seed = rng.randrange(1, 2_000_000_000)
         gen = np.random.default_rng(seed)
@@ -381,7 +527,8 @@ def pat_noise(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:flo
         else:
             buf[i] = buf[i+1] = buf[i+2] = base
     img = Image.frombytes("RGB", (sw,sh), bytes(buf)).convert("RGBA")
-    img = img.resize((W,H), Image.BICUBIC)
+    # BICUBIC's wider kernel buys nothing on random noise
+    img = img.resize((W,H), Image.BILINEAR)
     img.putalpha(255)
     return img
 
@@ -432,6 +579,40 @@ def pat_flowfield(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp
         a = (ang + 0.7*ang2) * math.pi
         return math.cos(a), math.sin(a)
 
+    if np is not None:
+        # Start points come in one batch from a Generator seeded off rng (as
+        # pat_noise does), then every particle advances in lockstep: one batch
+        # of trig per step instead of one call per particle
+        gen = np.random.default_rng(rng.randrange(1, 2_000_000_000))
+        pick = color_picker(rng, is_color, pal)
+        alpha = int(80 + 150*comp)
+        cols = [pick(alpha) for _ in range(n_particles)]
+        path = np.empty((steps + 1, n_particles, 2))
+        path[0] = gen.random((n_particles, 2)) * (W, H)
+        x = path[0, :, 0].copy()
+        y = path[0, :, 1].copy()
+        n_segs = np.full(n_particles, steps, dtype=np.intp)
+        alive = np.ones(n_particles, dtype=bool)
+        for s in range(steps):
+            ang = np.sin(x*k1 + phase1) + np.cos(y*k2 + phase2)
+            ang2 = np.sin((x+y)*k1*0.7 + phase2)
+            a = (ang + 0.7*ang2) * math.pi
+            x = x + np.cos(a)*step_len
+            y = y + np.sin(a)*step_len
+            path[s + 1, :, 0] = x
+            path[s + 1, :, 1] = y
+            # a particle's last segment is the one that left the canvas
+            left = alive & ((x < 0) | (x >= W) | (y < 0) | (y >= H))
+            n_segs[left] = s + 1
+            alive &= ~left
+            if not alive.any():
+                break
+        # One polyline per particle, in the original particle order
+        paths = path.transpose(1, 0, 2)
+        for i in range(n_particles):
+            d.line(paths[i, :n_segs[i] + 1].ravel().tolist(), fill=cols[i], width=1)
+        return img
+
     for _ in range(n_particles):
         x = rng.random()*W
         y = rng.random()*H
@@ -447,6 +628,64 @@ def pat_flowfield(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp
                 break
     return img
 
+def _nearest_runs(sites, width: int) -> List[Tuple[int,int,int]]:
+    """
+    1-D distance transform (Felzenszwalb-Huttenlocher lower envelope).
+    sites: (x, h, i) sorted by x, with distance (px - x)^2 + h.
+    Returns (i, start, end) runs covering pixels 0..width-1.
+    """
+    v = []  # envelope sites
+    z = []  # left boundary of each site's piece
+    for site in sites:
+        qx, qh, _ = site
+        s = -math.inf
+        while v:
+            vx, vh, _ = v[-1]
+            if qx == vx:
+                if qh >= vh:
+                    break
+                v.pop(); z.pop()
+                continue
+            s = ((qh + qx*qx) - (vh + vx*vx)) / (2.0*(qx - vx))
+            if s <= z[-1]:
+                v.pop(); z.pop()
+            else:
+                break
+        else:
+            s = -math.inf
+        if v and qx == v[-1][0]:
+            continue
+        v.append(site)
+        z.append(s)
+
+    runs = []
+    for k, site in enumerate(v):
+        start = 0 if k == 0 else max(0, math.ceil(z[k]))  # z[0] is -inf
+        end = width if k + 1 == len(v) else min(width, math.ceil(z[k+1]))
+        if end > start:
+            runs.append((site[2], start, end))
+    return runs
+
+# Per-size coordinate axes for the NumPy Voronoi; every design in a batch has
+# the same size, so they are built once per run. Read-only, so a preview on the
+# Tk thread and an in-process export can share them safely
+_VORONOI_AXES: Dict[Tuple[int,int], tuple] = {}
+
+def _voronoi_axes(W: int, H: int) -> tuple:
+    key = (W, H)
+    axes = _VORONOI_AXES.pop(key, None)
+    if axes is None:
+        if len(_VORONOI_AXES) >= 4:
+            _VORONOI_AXES.pop(next(iter(_VORONOI_AXES)), None)
+        xs = np.arange(W, dtype=np.float64)
+        ys = np.arange(H, dtype=np.float64)
+        xs.flags.writeable = False
+        ys.flags.writeable = False
+        axes = (xs, ys)
+    # re-insert so the dict stays in least-recently-used order
+    _VORONOI_AXES[key] = axes
+    return axes
+
 def pat_voronoi(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:float) -> Image.Image:
     """
     Voronoi-style cell field. NumPy accelerated when available; otherwise uses low-res approximation then upscales.
@@ -457,21 +696,15 @@ def pat_voronoi(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:f
         sw, sh = max(220, W//3), max(160, H//3)
         points = [(rng.random()*sw, rng.random()*sh) for _ in range(n)]
         colors = [pick_color(rng, is_color, pal, alpha=255) for _ in range(n)]
-        # brute force nearest at small resolution
-        img = Image.new("RGBA", (sw, sh), (0,0,0,0))
-        px = img.load()
+        # exact nearest site per row from the lower envelope of the sites'
+        # distance parabolas: O(n + sw) per row instead of O(n * sw)
+        cell = [bytes(c) for c in colors]
+        by_x = sorted(range(n), key=lambda i: points[i][0])
+        rows = []
         for y in range(sh):
-            for x in range(sw):
-                best_i = 0
-                best_d = 1e18
-                for i,(pxi, pyi) in enumerate(points):
-                    dx = x - pxi
-                    dy = y - pyi
-                    dd = dx*dx + dy*dy
-                    if dd < best_d:
-                        best_d = dd
-                        best_i = i
-                px[x,y] = colors[best_i]
+            env = _nearest_runs(((points[i][0], (y - points[i][1])**2, i) for i in by_x), sw)
+            rows.append(b"".join(cell[i] * (end - start) for i, start, end in env))
+        img = Image.frombytes("RGBA", (sw, sh), b"".join(rows))
         # edge emphasis (simple)
         img = img.filter(ImageFilter.FIND_EDGES)
         img = img.resize((W,H), Image.BICUBIC)
@@ -482,12 +715,23 @@ def pat_voronoi(rng: random.Random, W:int, H:int, is_color:bool, pal:str, comp:f
     points = np.stack([np.array([rng.random()*W, rng.random()*H]) for _ in range(n)], axis=0)  # (n,2)
     cols = np.array([pick_color(rng, is_color, pal, 255)[:3] for _ in range(n)], dtype=np.uint8)  # (n,3)
 
-    ys, xs = np.mgrid[0:H, 0:W].astype(np.float32)
-    # compute squared distances (H,W,n)
-    dx = xs[..., None] - points[:, 0][None, None, :]
-    dy = ys[..., None] - points[:, 1][None, None, :]
-    dist = dx*dx + dy*dy
-    idx = np.argmin(dist, axis=2)  # (H,W)
+    # Running nearest site, one site at a time: peak memory stays O(H*W) instead
+    # of an (H,W,n) distance tensor. Distances are separable, so each site costs
+    # one broadcast add of a column and a row of squared offsets.
+    # Scratch planes are per call: renders can run on two threads at once
+    xs, ys = _voronoi_axes(W, H)
+    best_d = np.full((H, W), np.inf)
+    idx = np.zeros((H, W), dtype=np.intp)
+    dist = np.empty((H, W))
+    closer = np.empty((H, W), dtype=bool)
+    for i, (px, py) in enumerate(points):
+        dx = xs - px
+        dy = ys - py
+        np.add((dx*dx)[None, :], (dy*dy)[:, None], out=dist)
+        # strict < keeps the lowest index on ties, as argmin did
+        np.less(dist, best_d, out=closer)
+        np.copyto(best_d, dist, where=closer)
+        np.copyto(idx, i, where=closer)
     out = cols[idx]  # (H,W,3)
     img = Image.fromarray(out, mode="RGB").convert("RGBA")
 
@@ -534,14 +778,29 @@ class EngineConfig:
     complexity: float = 0.78
     fast_mode: bool = True
     jpeg_quality: int = 88
+    jpeg_optimize: bool = False  # optimized Huffman + progressive: ~7% smaller, ~5x slower encodes
     save_png_set: bool = False
     combined_pdf: bool = False
+    combined_pdf_share_render: bool = True  # combined B/W half = grayscale of the color render
     fixed_pattern_order: bool = False
 
 class PatternEngine:
     def __init__(self, patterns: Dict[str, callable]):
         self.patterns = patterns
         self.pattern_names = list(patterns.keys())
+        self._noise_atlases: Dict[Tuple[int,int], "np.ndarray"] = {}
+        self._export_pool = None  # set while export_pdfs runs
+
+    def _noise_atlas(self, W: int, H: int) -> Optional["np.ndarray"]:
+        """Double-size noise block shared by every design of one size (NumPy only)"""
+        if np is None:
+            return None
+        atlas = self._noise_atlases.get((W, H))
+        if atlas is None:
+            self._noise_atlases.clear()
+            atlas = np.random.default_rng(0).integers(0, 256, size=(H*2, W*2, 3), dtype=np.uint8)
+            self._noise_atlases[(W, H)] = atlas
+        return atlas
 
     def _pick_palette(self, rng: random.Random, palette_mode: str, is_color: bool) -> str:
         if not is_color:
@@ -588,7 +847,8 @@ class PatternEngine:
 
         # subtle base texture
         tex_rng = random.Random(seed ^ 0x1234ABCD)
-        base = Image.alpha_composite(base, pat_noise(tex_rng, w2, h2, False, "subtle", min(0.35, comp)))
+        base = Image.alpha_composite(base, pat_noise(tex_rng, w2, h2, False, "subtle", min(0.35, comp),
+                                                     atlas=self._noise_atlas(w2, h2)))
 
         # pattern choice
         pats = [p for p in selected_patterns if p in self.patterns]
@@ -609,9 +869,9 @@ class PatternEngine:
             mode = "source-over" if idx == 0 else blend
             base = blend_layer(base, layer, mode, a)
 
-        # upscale back if needed
+        # upscale back if needed; fast mode trades the filter for speed
         if scale != 1.0:
-            base = base.resize((W,H), Image.BILINEAR)
+            base = base.resize((W,H), Image.NEAREST)
 
         # alignment marks
         d = ImageDraw.Draw(base)
@@ -639,6 +899,12 @@ class PatternEngine:
         }
         return base, meta
 
+    def cancel_export(self):
+        """Drop the queued renders of a running export; only in-flight ones still finish"""
+        pool = self._export_pool
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def export_pdfs(
         self,
         out_dir: str,
@@ -647,7 +913,16 @@ class PatternEngine:
         progress_cb=None,
         stop_flag=None
     ) -> Dict[str,str]:
+        # reportlab is only needed from here on; importing it lazily keeps it out of
+        # GUI startup and out of the render worker processes
+        from reportlab.pdfgen import canvas as rl_canvas
+        from reportlab.lib.pagesizes import A4
+
         os.makedirs(out_dir, exist_ok=True)
+        # Same bounds the GUI applies; above 95 libjpeg only grows files
+        q = max(50, min(95, int(cfg.jpeg_quality)))
+        if q != cfg.jpeg_quality:
+            cfg = replace(cfg, jpeg_quality=q)
 
         base_seed = cfg.seed if cfg.seed and cfg.seed > 0 else random.randrange(1, 2_000_000_000)
         seeds = self._design_seeds(base_seed, cfg.count)
@@ -683,123 +958,185 @@ class PatternEngine:
         slot_h = (page_h - 2*margin - header_h - footer_h - gap) / 2.0
 
         def header(c):
-            c.setFillColorRGB(0,0,0)
-            c.rect(0, page_h-header_h, page_w, header_h, fill=1, stroke=0)
-            c.setFillColorRGB(1,1,1)
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(margin, page_h-header_h+10, title)
-            c.setFont("Helvetica", 9)
-            c.drawRightString(page_w-margin, page_h-header_h+11, f"Generated {today} • run seed {base_seed}")
-
-        # 1) mixed color pdf (only color designs)
-        c_color = rl_canvas.Canvas(color_pdf, pagesize=A4)
-        c_bw = rl_canvas.Canvas(bw_pdf, pagesize=A4)
-        c_comb = rl_canvas.Canvas(combined_pdf, pagesize=A4) if combined_pdf else None
-
-        color_indices = [i for i, f in enumerate(flags) if f]
-        bw_indices = [i for i, f in enumerate(flags) if not f]
-
-        def draw_two_per_page(c, indices, kind_label: str):
-            pages = math.ceil(len(indices)/2) if indices else 1
-            for p in range(pages):
-                if stop_flag and stop_flag():
-                    break
-                header(c)
-                for pos in range(2):
-                    k = p*2 + pos
-                    if k >= len(indices):
-                        break
-                    idx = indices[k]
-                    is_color = (kind_label == "COLOR")
-                    img, meta = self.render_design(seeds[idx], cfg, is_color=is_color, selected_patterns=selected_patterns)
-
-                    # PNG set
-                    if cfg.save_png_set:
-                        fn = f"design_{(idx+1):03d}_seed_{meta['seed']}.png"
-                        if is_color:
-                            img.save(os.path.join(png_color_dir, fn))
-                        else:
-                            img.convert("L").convert("RGB").save(os.path.join(png_bw_dir, fn))
+            # identical on every page: drawn once per PDF as a form, then referenced
+            if not c.hasForm("header"):
+                c.beginForm("header")
+                c.setFillColorRGB(0,0,0)
+                c.rect(0, page_h-header_h, page_w, header_h, fill=1, stroke=0)
+                c.setFillColorRGB(1,1,1)
+                c.setFont("Helvetica-Bold", 12)
+                c.drawString(margin, page_h-header_h+10, title)
+                c.setFont("Helvetica", 9)
+                c.drawRightString(page_w-margin, page_h-header_h+11, f"Generated {today} • run seed {base_seed}")
+                c.endForm()
+            c.doForm("header")
+
+        # Designs are rendered and JPEG-encoded in worker processes; pages are
+        # assembled here, in order, as results come back
+        pool = None
+        # no more processes than there are jobs to hand them
+        n_jobs = cfg.count * (2 if cfg.combined_pdf else 1)
+        workers = min(os.cpu_count() or 1, n_jobs)
+        if workers > 1:
+            try:
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                                           initargs=(self.patterns, cfg, selected_patterns))
+            except (OSError, NotImplementedError, ImportError):
+                pool = None
+        in_process = pool is None
+        if in_process:
+            # no worker processes: still render on a background thread so that
+            # JPEG encoding and page emission overlap the next render
+            pool = ThreadPoolExecutor(max_workers=1)
+            workers = 1
+        self._export_pool = pool
+        if in_process:
+            single = partial(_render_job, self, cfg, selected_patterns)
+            pair = partial(_render_pair_job, self, cfg, selected_patterns)
+        else:
+            single, pair = _render_job_in_worker, _render_pair_job_in_worker
+
+        # Jobs go in through a sliding window instead of all up front: finished
+        # designs waiting for their PDF stay bounded, and Stop (checked per page)
+        # leaves at most a window of renders behind
+        window = max(4, workers * 2)
+        def render(jobs):
+            jobs = iter(jobs)
+            pending = deque()
+            def fill():
+                while len(pending) < window:
+                    job = next(jobs, None)
+                    if job is None:
+                        return
+                    pending.append(pool.submit(*job))
+            fill()
+            while pending:
+                future = pending.popleft()
+                fill()
+                yield future.result()
+
+        def png_path(kind_dir, idx):
+            if not cfg.save_png_set:
+                return None
+            return os.path.join(kind_dir, f"design_{(idx+1):03d}_seed_{seeds[idx]}.png")
 
-                    # embed
-                    buf = io.BytesIO()
-                    img.convert("RGB").save(buf, format="JPEG", quality=int(cfg.jpeg_quality), optimize=True)
-                    buf.seek(0)
-                    x = margin
-                    y = margin + footer_h + (1-pos)*(slot_h + gap)
+        try:
+            # 1) mixed color pdf (only color designs)
+            c_color = rl_canvas.Canvas(color_pdf, pagesize=A4)
+            c_bw = rl_canvas.Canvas(bw_pdf, pagesize=A4)
+            c_comb = rl_canvas.Canvas(combined_pdf, pagesize=A4) if combined_pdf else None
+
+            color_indices = [i for i, f in enumerate(flags) if f]
+            bw_indices = [i for i, f in enumerate(flags) if not f]
+
+            # One ordered stream for every section: color, then B&W, then combined,
+            # in exactly the order the pages below consume them
+            jobs = [(single, (seeds[i], True, png_path(png_color_dir, i))) for i in color_indices]
+            jobs += [(single, (seeds[i], False, png_path(png_bw_dir, i))) for i in bw_indices]
+            share_render = cfg.combined_pdf_share_render
+            # Without a shared render, each design's own-PDF variant is already encoded by
+            # the color/B&W passes; keep those bytes for the combined page and only render
+            # the other variant. Entries are dropped as the combined pass uses them.
+            encoded = {} if (c_comb and not share_render) else None
+            if c_comb and share_render:
+                jobs += [(pair, seed) for seed in seeds[:cfg.count]]
+            elif c_comb:
+                jobs += [(single, (seeds[i], not flags[i], None)) for i in range(cfg.count)]
+            color_results = bw_results = comb_results = render(jobs)
+
+            def draw_two_per_page(c, indices, results, kind_label: str):
+                pages = math.ceil(len(indices)/2) if indices else 1
+                for p in range(pages):
+                    if stop_flag and stop_flag():
+                        break
+                    header(c)
+                    for pos in range(2):
+                        k = p*2 + pos
+                        if k >= len(indices):
+                            break
+                        idx = indices[k]
+                        # embed (PNG-set copy was already written by the render job)
+                        jpeg, meta = next(results)
+                        if encoded is not None:
+                            encoded[idx] = (jpeg, meta)
+                        x = margin
+                        y = margin + footer_h + (1-pos)*(slot_h + gap)
+
+                        c.setFillColorRGB(1,1,1)
+                        c.rect(x-2, y-2, slot_w+4, slot_h+4, fill=1, stroke=0)
+                        _draw_jpeg(c, f"design{idx}", jpeg, x, y, slot_w, slot_h)
+
+                        c.setFillColorRGB(0,0,0)
+                        c.rect(x, y, slot_w, 18, fill=1, stroke=0)
+                        c.setFillColorRGB(1,1,1)
+                        if pos == 0:
+                            # image placement restores state, so the font holds for the second slot
+                            c.setFont("Helvetica", 8.6)
+                        label = f"{kind_label} • design {(idx+1):03d} • seed {meta['seed']} • {', '.join(meta['patterns'])} • blend {meta['blend']} • palette {meta['palette']}"
+                        c.drawString(x+6, y+5, label[:160])
+
+                        if progress_cb:
+                            progress_cb()
+
+                    c.setFillColorRGB(0.25,0.25,0.25)
+                    c.setFont("Helvetica", 9)
+                    c.drawCentredString(page_w/2, margin/2, f"Page {p+1} of {pages}")
+                    c.showPage()
+
+            # color-only and bw-only pdfs
+            draw_two_per_page(c_color, color_indices, color_results, "COLOR")
+            c_color.save()
+
+            draw_two_per_page(c_bw, bw_indices, bw_results, "B&W")
+            c_bw.save()
+
+            # combined: one design per page
+            if c_comb:
+                pages = len(seeds)
+                for idx in range(cfg.count):
+                    if stop_flag and stop_flag():
+                        break
+                    header(c_comb)
 
-                    c.setFillColorRGB(1,1,1)
-                    c.rect(x-2, y-2, slot_w+4, slot_h+4, fill=1, stroke=0)
-                    c.drawImage(ImageReader(buf), x, y, width=slot_w, height=slot_h, preserveAspectRatio=True, anchor='c')
+                    # top = color, bottom = bw for same design
+                    if share_render:
+                        jpeg_c, jpeg_b, meta_c = next(comb_results)
+                    else:
+                        own = encoded.pop(idx)
+                        other = next(comb_results)
+                        (jpeg_c, meta_c), (jpeg_b, meta_b) = (own, other) if flags[idx] else (other, own)
 
-                    c.setFillColorRGB(0,0,0)
-                    c.rect(x, y, slot_w, 18, fill=1, stroke=0)
-                    c.setFillColorRGB(1,1,1)
-                    c.setFont("Helvetica", 8.6)
-                    label = f"{kind_label} • design {(idx+1):03d} • seed {meta['seed']} • {', '.join(meta['patterns'])} • blend {meta['blend']} • palette {meta['palette']}"
-                    c.drawString(x+6, y+5, label[:160])
+                    # top
+                    x = margin
+                    y_top = margin + footer_h + slot_h + gap
+                    c_comb.setFillColorRGB(1,1,1)
+                    c_comb.rect(x-2, y_top-2, slot_w+4, slot_h+4, fill=1, stroke=0)
+                    _draw_jpeg(c_comb, f"design{idx}c", jpeg_c, x, y_top, slot_w, slot_h)
+
+                    # bottom
+                    y_bot = margin + footer_h
+                    c_comb.setFillColorRGB(1,1,1)
+                    c_comb.rect(x-2, y_bot-2, slot_w+4, slot_h+4, fill=1, stroke=0)
+                    _draw_jpeg(c_comb, f"design{idx}b", jpeg_b, x, y_bot, slot_w, slot_h)
+
+                    c_comb.setFillColorRGB(0,0,0)
+                    c_comb.rect(x, y_bot, slot_w, 18, fill=1, stroke=0)
+                    c_comb.setFillColorRGB(1,1,1)
+                    c_comb.setFont("Helvetica", 8.6)
+                    label = f"design {(idx+1):03d} • seed {seeds[idx]} • {', '.join(meta_c['patterns'])} • blend {meta_c['blend']} • palette {meta_c['palette']}"
+                    c_comb.drawString(x+6, y_bot+5, label[:160])
 
                     if progress_cb:
                         progress_cb()
 
-                c.setFillColorRGB(0.25,0.25,0.25)
-                c.setFont("Helvetica", 9)
-                c.drawCentredString(page_w/2, margin/2, f"Page {p+1} of {pages}")
-                c.showPage()
-
-        # color-only and bw-only pdfs
-        draw_two_per_page(c_color, color_indices, "COLOR")
-        c_color.save()
-
-        draw_two_per_page(c_bw, bw_indices, "B&W")
-        c_bw.save()
-
-        # combined: one design per page
-        if c_comb:
-            pages = len(seeds)
-            for idx in range(cfg.count):
-                if stop_flag and stop_flag():
-                    break
-                header(c_comb)
-
-                # top = color, bottom = bw for same design
-                img_c, meta_c = self.render_design(seeds[idx], cfg, is_color=True, selected_patterns=selected_patterns)
-                img_b, meta_b = self.render_design(seeds[idx], cfg, is_color=False, selected_patterns=selected_patterns)
-
-                # top
-                buf = io.BytesIO()
-                img_c.convert("RGB").save(buf, format="JPEG", quality=int(cfg.jpeg_quality), optimize=True)
-                buf.seek(0)
-                x = margin
-                y_top = margin + footer_h + slot_h + gap
-                c_comb.setFillColorRGB(1,1,1)
-                c_comb.rect(x-2, y_top-2, slot_w+4, slot_h+4, fill=1, stroke=0)
-                c_comb.drawImage(ImageReader(buf), x, y_top, width=slot_w, height=slot_h, preserveAspectRatio=True, anchor='c')
-
-                # bottom
-                buf2 = io.BytesIO()
-                img_b.convert("RGB").save(buf2, format="JPEG", quality=int(cfg.jpeg_quality), optimize=True)
-                buf2.seek(0)
-                y_bot = margin + footer_h
-                c_comb.setFillColorRGB(1,1,1)
-                c_comb.rect(x-2, y_bot-2, slot_w+4, slot_h+4, fill=1, stroke=0)
-                c_comb.drawImage(ImageReader(buf2), x, y_bot, width=slot_w, height=slot_h, preserveAspectRatio=True, anchor='c')
-
-                c_comb.setFillColorRGB(0,0,0)
-                c_comb.rect(x, y_bot, slot_w, 18, fill=1, stroke=0)
-                c_comb.setFillColorRGB(1,1,1)
-                c_comb.setFont("Helvetica", 8.6)
-                label = f"design {(idx+1):03d} • seed {seeds[idx]} • {', '.join(meta_c['patterns'])} • blend {meta_c['blend']} • palette {meta_c['palette']}"
-                c_comb.drawString(x+6, y_bot+5, label[:160])
-
-                if progress_cb:
-                    progress_cb()
-
-                c_comb.setFillColorRGB(0.25,0.25,0.25)
-                c_comb.setFont("Helvetica", 9)
-                c_comb.drawCentredString(page_w/2, margin/2, f"Page {idx+1} of {pages}")
-                c_comb.showPage()
-            c_comb.save()
+                    c_comb.setFillColorRGB(0.25,0.25,0.25)
+                    c_comb.setFont("Helvetica", 9)
+                    c_comb.drawCentredString(page_w/2, margin/2, f"Page {idx+1} of {pages}")
+                    c_comb.showPage()
+                c_comb.save()
+        finally:
+            self._export_pool = None
+            pool.shutdown(wait=True, cancel_futures=True)
 
         return {
             "color_pdf": color_pdf,
@@ -811,8 +1148,86 @@ class PatternEngine:
         }
 
 
+def _render_job(engine: PatternEngine, cfg: EngineConfig, selected_patterns: List[str], job) -> Tuple[bytes, Dict]:
+    """Render one (seed, is_color, png_path) job; returns the JPEG bytes for the PDF and the design meta."""
+    seed, is_color, png_path = job
+    img, meta = engine.render_design(seed, cfg, is_color=is_color, selected_patterns=selected_patterns)
+    if png_path:
+        (img if is_color else img.convert("L").convert("RGB")).save(png_path)
+    return _encode_jpeg(img, int(cfg.jpeg_quality), cfg.jpeg_optimize), meta
+
+def _render_pair_job(engine: PatternEngine, cfg: EngineConfig, selected_patterns: List[str], seed: int) -> Tuple[bytes, bytes, Dict]:
+    """Render one design in color and derive its B/W twin from the same pixels; returns both JPEGs and the meta."""
+    img, meta = engine.render_design(seed, cfg, is_color=True, selected_patterns=selected_patterns)
+    rgb = _as_rgb(img)
+    q, opt = int(cfg.jpeg_quality), cfg.jpeg_optimize
+    return _encode_jpeg(rgb, q, opt), _encode_jpeg(rgb.convert("L").convert("RGB"), q, opt), meta
+
+def _as_rgb(img: Image.Image) -> Image.Image:
+    # convert() copies even when the mode already matches
+    return img if img.mode == "RGB" else img.convert("RGB")
+
+def _encode_jpeg(img: Image.Image, quality: int, optimize: bool = False) -> bytes:
+    rgb = _as_rgb(img)
+    if not optimize and np is not None:
+        if _tj is not None:
+            return _tj.encode(np.asarray(rgb), quality=quality, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+        if simplejpeg is not None:
+            return simplejpeg.encode_jpeg(np.asarray(rgb), quality=quality, colorspace="RGB",
+                                          colorsubsampling="420", fastdct=True)
+    # 4:2:0 everywhere (PyTurboJPEG would default to 4:2:2); the Huffman-optimizing
+    # and progressive passes only run when smallest files were asked for
+    buf = io.BytesIO()
+    rgb.save(buf, format="JPEG", quality=quality, subsampling=2, optimize=optimize, progressive=optimize)
+    return buf.getvalue()
+
+def _draw_jpeg(c, name: str, jpeg: bytes, x: float, y: float, width: float, height: float):
+    """
+    drawImage(..., preserveAspectRatio=True, anchor='c') for already-encoded JPEG bytes.
+    The stream goes into the PDF verbatim as a DCTDecode XObject; drawImage with an
+    ImageReader would first decode the whole image just to hash a name for it.
+    """
+    from reportlab.lib.utils import ImageReader
+    from reportlab.lib.boxstuff import aspectRatioFix
+    from reportlab.pdfbase.pdfdoc import PDFImageXObject
+
+    img = PDFImageXObject(name)
+    if not img.loadImageFromJPEG(io.BytesIO(jpeg)):
+        c.drawImage(ImageReader(io.BytesIO(jpeg)), x, y, width=width, height=height, preserveAspectRatio=True, anchor='c')
+        return
+    # Kept binary: with rl_config.useA85 the loader ASCII85-encodes the stream,
+    # re-encoding every byte in Python and growing it by 25%
+    img.streamContent = jpeg
+    img._filters = ('DCTDecode',)
+    c._currentPageHasImages = 1
+    c._setXObjects(img)
+    c._doc.addForm(name, img)
+    x, y, width, height, _ = aspectRatioFix(True, 'c', x, y, width, height, img.width, img.height)
+    c.saveState()
+    c.translate(x, y)
+    c.scale(width, height)
+    c.doForm(name)
+    c.restoreState()
+
+# set once per worker process by the export pool's initializer
+_worker_job_args = None
+
+def _init_render_worker(patterns: Dict[str, callable], cfg: EngineConfig, selected_patterns: List[str]):
+    global _worker_job_args
+    _worker_job_args = (PatternEngine(patterns), cfg, selected_patterns)
+
+def _render_job_in_worker(job) -> Tuple[bytes, Dict]:
+    return _render_job(*_worker_job_args, job)
+
+def _render_pair_job_in_worker(seed: int) -> Tuple[bytes, bytes, Dict]:
+    return _render_pair_job(*_worker_job_args, seed)
+
+
 # ------------------ GUI ------------------
 
+LOG_MAX_LINES = 2000
+LOG_TRIM_LINES = 100
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -820,12 +1235,23 @@ class App(tk.Tk):
         self.geometry("1100x720")
         self.minsize(980, 680)
 
-        self.engine = PatternEngine(PATTERNS)
-        self._stop = False
+        self._engine = None  # created on first preview/export
+        self._stop = threading.Event()
+        self._closing = False
         self._preview_imgs = (None, None)
         self._preview_tk = (None, None)
 
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        # The export thread is a daemon, but the pool would still render every
+        # queued design before the process could exit: stop and drop them first
+        self._closing = True
+        self._stop.set()
+        if self._engine is not None:
+            self._engine.cancel_export()
+        self.destroy()
 
     def _build_ui(self):
         root = ttk.Frame(self, padding=12)
@@ -862,9 +1288,11 @@ class App(tk.Tk):
         self.comp_var = tk.DoubleVar(value=0.78)
 
         self.jpegq_var = tk.IntVar(value=88)
+        self.jpeg_opt_var = tk.BooleanVar(value=False)
         self.fast_var = tk.BooleanVar(value=True)
         self.save_png_var = tk.BooleanVar(value=False)
         self.combined_var = tk.BooleanVar(value=False)
+        self.combined_share_var = tk.BooleanVar(value=True)
         self.fixed_order_var = tk.BooleanVar(value=False)
 
         row = 0
@@ -901,6 +1329,8 @@ class App(tk.Tk):
         ttk.Label(run_box, text="JPEG quality (50–95)").grid(row=row, column=0, sticky="w")
         ttk.Entry(run_box, textvariable=self.jpegq_var, width=10).grid(row=row, column=1, sticky="w")
         row += 1
+        ttk.Checkbutton(run_box, text="Smallest JPEGs (slower encode)", variable=self.jpeg_opt_var).grid(row=row, column=0, columnspan=2, sticky="w")
+        row += 1
 
         ttk.Checkbutton(run_box, text="Fast mode (recommended)", variable=self.fast_var).grid(row=row, column=0, columnspan=2, sticky="w")
         row += 1
@@ -908,6 +1338,8 @@ class App(tk.Tk):
         row += 1
         ttk.Checkbutton(run_box, text="Combined PDF (color + B/W per design)", variable=self.combined_var).grid(row=row, column=0, columnspan=2, sticky="w")
         row += 1
+        ttk.Checkbutton(run_box, text="Combined: B/W from color render (faster)", variable=self.combined_share_var).grid(row=row, column=0, columnspan=2, sticky="w")
+        row += 1
         ttk.Checkbutton(run_box, text="Fixed pattern order (controlled testing)", variable=self.fixed_order_var).grid(row=row, column=0, columnspan=2, sticky="w")
 
         run_box.columnconfigure(1, weight=1)
@@ -932,7 +1364,7 @@ class App(tk.Tk):
         pat_box.pack(fill="both", expand=True, pady=6)
 
         self.pat_list = tk.Listbox(pat_box, selectmode="extended", height=14)
-        for name in sorted(self.engine.pattern_names):
+        for name in sorted(PATTERNS):
             self.pat_list.insert("end", name)
         self.pat_list.pack(side="left", fill="both", expand=True)
         sb = ttk.Scrollbar(pat_box, orient="vertical", command=self.pat_list.yview)
@@ -950,7 +1382,8 @@ class App(tk.Tk):
         act.pack(fill="x", pady=8)
 
         ttk.Button(act, text="Preview 1 design", command=self.preview_one).pack(fill="x")
-        ttk.Button(act, text="Generate PDFs", command=self.generate).pack(fill="x", pady=(8,0))
+        self.gen_btn = ttk.Button(act, text="Generate PDFs", command=self.generate)
+        self.gen_btn.pack(fill="x", pady=(8,0))
         ttk.Button(act, text="Stop", command=self.stop).pack(fill="x", pady=(8,0))
         ttk.Button(act, text="Open output folder", command=self.open_output).pack(fill="x", pady=(8,0))
 
@@ -967,7 +1400,7 @@ class App(tk.Tk):
 
         info = ttk.LabelFrame(right, text="Run log", padding=10)
         info.pack(fill="both", expand=True, pady=(10,0))
-        self.log = tk.Text(info, height=12, wrap="word")
+        self.log = tk.Text(info, height=12, wrap="word", undo=False, maxundo=0)
         self.log.pack(fill="both", expand=True)
 
         self.status = ttk.Label(right, text="Ready.")
@@ -980,13 +1413,27 @@ class App(tk.Tk):
         self._select_curated()
         self._log_env()
 
+    @property
+    def engine(self) -> PatternEngine:
+        if self._engine is None:
+            self._engine = PatternEngine(PATTERNS)
+        return self._engine
+
     def _log(self, s: str):
         self.log.insert("end", s + "\n")
+        # keep the widget bounded over long sessions; trim in blocks, not per line
+        if int(self.log.index("end-1c").split(".")[0]) > LOG_MAX_LINES:
+            self.log.delete("1.0", f"{LOG_TRIM_LINES + 1}.0")
         self.log.see("end")
         self.update_idletasks()
 
     def _log_env(self):
         self._log(f"NumPy: {'available' if np is not None else 'not installed'}")
+        self._log(f"Numba: {'available' if _blend_fused is not None else 'not installed'}")
+        if np is not None and (_tj is not None or simplejpeg is not None):
+            self._log(f"JPEG encoder: {'TurboJPEG' if _tj is not None else 'simplejpeg'}")
+        else:
+            self._log("JPEG encoder: Pillow (install PyTurboJPEG or simplejpeg for faster export)")
         self._log(f"ImageTk: {'available' if ImageTk is not None else 'missing (preview may be limited)'}")
         self._log("Tip: enable Fast mode if generation is slow.")
 
@@ -1022,8 +1469,10 @@ class App(tk.Tk):
             complexity=float(self.comp_var.get()),
             fast_mode=bool(self.fast_var.get()),
             jpeg_quality=max(50, min(95, int(self.jpegq_var.get()))),
+            jpeg_optimize=bool(self.jpeg_opt_var.get()),
             save_png_set=bool(self.save_png_var.get()),
             combined_pdf=bool(self.combined_var.get()),
+            combined_pdf_share_render=bool(self.combined_share_var.get()),
             fixed_pattern_order=bool(self.fixed_order_var.get()),
         )
 
@@ -1057,13 +1506,16 @@ class App(tk.Tk):
                 w,h = img.size
                 s = min(max_w/w, max_h/h)
                 if s < 1:
-                    return img.resize((int(w*s), int(h*s)), Image.BILINEAR)
+                    # Designs are opaque, so dropping alpha first spares resize its
+                    # premultiply pass; reducing_gap lets an integer box reduce() do
+                    # most of the shrinking before the bilinear pass
+                    return img.convert("RGB").resize((int(w*s), int(h*s)), Image.BILINEAR, reducing_gap=1.0)
                 return img
 
-            imc = fit(img_c).convert("RGB")
-            imb = fit(img_b).convert("RGB")
-            tkc = ImageTk.PhotoImage(imc)
-            tkb = ImageTk.PhotoImage(imb)
+            # ImageTk blits RGB/RGBA directly; a paletted copy would only be
+            # expanded back to 4 bytes/pixel on the way in
+            tkc = ImageTk.PhotoImage(fit(img_c))
+            tkb = ImageTk.PhotoImage(fit(img_b))
             self._preview_tk = (tkc, tkb)
             self.prev_label_c.configure(image=tkc, text="")
             self.prev_label_b.configure(image=tkb, text="")
@@ -1071,61 +1523,85 @@ class App(tk.Tk):
             messagebox.showerror("Preview error", str(e))
 
     def stop(self):
-        self._stop = True
+        self._stop.set()
         self.status.configure(text="Stopping…")
 
     def generate(self):
-        self._stop = False
+        self._stop.clear()
         try:
             cfg = self._cfg()
             pats = self._selected_patterns()
             out_dir = self.out_dir.get().strip() or os.path.join(os.getcwd(), "output")
             os.makedirs(out_dir, exist_ok=True)
-
-            total_pages_color = math.ceil(int(round(cfg.count*0.75))/2)
-            total_pages_bw = math.ceil((cfg.count - int(round(cfg.count*0.75)))/2)
-            # progress units: one per embedded design; approx = count + optional combined count
-            max_units = cfg.count  # color + bw designs total = count
-            if cfg.combined_pdf:
-                max_units += cfg.count
-            self.progress.configure(maximum=max_units, value=0)
-
-            self._log("—" * 60)
-            self._log(f"Generating… count={cfg.count} size={cfg.width}x{cfg.height} layers={cfg.layers_min}-{cfg.layers_max}")
-            self._log(f"palette={cfg.palette_mode} blend={cfg.blend_mode} fast={cfg.fast_mode} png_set={cfg.save_png_set} combined={cfg.combined_pdf} fixed_order={cfg.fixed_pattern_order}")
-
-            counter = {"n": 0}
-            def tick():
-                counter["n"] += 1
-                self.progress.configure(value=counter["n"])
-                self.status.configure(text=f"Generating… {counter['n']}/{max_units}")
-                self.update_idletasks()
-
-            def stopped():
-                return self._stop
-
-            result = self.engine.export_pdfs(out_dir, cfg, pats, progress_cb=tick, stop_flag=stopped)
-            self.status.configure(text="Done.")
-            self._log(f"Run seed: {result['run_seed']}")
-            self._log(f"Color PDF: {result['color_pdf']}")
-            self._log(f"B&W PDF: {result['bw_pdf']}")
-            if cfg.combined_pdf:
-                self._log(f"Combined PDF: {result['combined_pdf']}")
-            if cfg.save_png_set:
-                self._log(f"PNG set: {os.path.join(out_dir, 'png_set')}")
         except Exception as e:
             messagebox.showerror("Generation error", str(e))
             self.status.configure(text="Error.")
+            return
+
+        # progress units: one per embedded design; approx = count + optional combined count
+        max_units = cfg.count  # color + bw designs total = count
+        if cfg.combined_pdf:
+            max_units += cfg.count
+        self.progress.configure(maximum=max_units, value=0)
+
+        self._log("—" * 60)
+        self._log(f"Generating… count={cfg.count} size={cfg.width}x{cfg.height} layers={cfg.layers_min}-{cfg.layers_max}")
+        self._log(f"palette={cfg.palette_mode} blend={cfg.blend_mode} fast={cfg.fast_mode} png_set={cfg.save_png_set} combined={cfg.combined_pdf} fixed_order={cfg.fixed_pattern_order}")
+
+        # Export runs off the Tk thread so the window keeps repainting and Stop stays
+        # clickable; the worker only hands results back through after()
+        self.gen_btn.configure(state="disabled")
+        threading.Thread(target=self._run_export, args=(out_dir, cfg, pats, max_units), daemon=True).start()
+
+    def _run_export(self, out_dir: str, cfg: EngineConfig, pats: List[str], max_units: int):
+        # progress reaches Tk at most every 100 ms (and always for the last unit)
+        counter = {"n": 0, "last": 0.0}
+        def tick():
+            counter["n"] += 1
+            now = time.monotonic()
+            if now - counter["last"] >= 0.1 or counter["n"] == max_units:
+                counter["last"] = now
+                self.after(0, self._tick_ui, counter["n"], max_units)
+
+        try:
+            result = self.engine.export_pdfs(out_dir, cfg, pats, progress_cb=tick, stop_flag=self._stop.is_set)
+        except Exception as e:
+            if not self._closing:
+                self.after(0, self._export_failed, str(e))
+        else:
+            if not self._closing:
+                self.after(0, self._export_done, out_dir, cfg, result)
+
+    def _tick_ui(self, n: int, max_units: int):
+        self.progress.configure(value=n)
+        self.status.configure(text=f"Generating… {n}/{max_units}")
+
+    def _export_done(self, out_dir: str, cfg: EngineConfig, result: Dict[str,str]):
+        self.gen_btn.configure(state="normal")
+        self.status.configure(text="Done.")
+        self._log(f"Run seed: {result['run_seed']}")
+        self._log(f"Color PDF: {result['color_pdf']}")
+        self._log(f"B&W PDF: {result['bw_pdf']}")
+        if cfg.combined_pdf:
+            self._log(f"Combined PDF: {result['combined_pdf']}")
+        if cfg.save_png_set:
+            self._log(f"PNG set: {os.path.join(out_dir, 'png_set')}")
+
+    def _export_failed(self, message: str):
+        self.gen_btn.configure(state="normal")
+        messagebox.showerror("Generation error", message)
+        self.status.configure(text="Error.")
 
     def open_output(self):
         p = self.out_dir.get().strip() or os.path.join(os.getcwd(), "output")
         try:
             if os.name == "nt":
                 os.startfile(p)  # type: ignore
-            elif sys.platform == "darwin":
-                os.system(f"open '{p}'")
             else:
-                os.system(f"xdg-open '{p}'")
+                # argv list, no shell: paths with spaces or quotes open as-is
+                opener = "open" if sys.platform == "darwin" else "xdg-open"
+                subprocess.Popen([opener, p], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
         except Exception:
             messagebox.showinfo("Output folder", f"Output folder:\n{p}")
 
@@ -2,7 +2,7 @@
 """
 IRWP-Toolbox (TUI)
 Option-driven terminal UI (no CLI flags), suitable for Termux (no root).
-NumPy is NOT required.
+NumPy is NOT required; when installed it accelerates the custom blend modes.
 
 Features:
 - Seeded RNG
@@ -13,10 +13,10 @@ Features:
 - Optional combined PDF (1 design per page: top color, bottom B/W)
 - Optional PNG set export
 - Fixed pattern order mode
-- Extra blend modes overlay/exclusion (pure-PIL fallback; fast mode recommended)
+- Extra blend modes overlay/exclusion (NumPy vectorised; ImageChops fallback)
 - Extra generators: spirals, voronoi (approx), flowfield
 
-Dependencies: pillow, reportlab
+Dependencies: pillow, reportlab, (optional) numpy, (optional) numba
 """
 
 import os
@@ -25,6 +25,8 @@ import math
 import time
 import random
 import datetime
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
 
@@ -32,6 +34,18 @@ from PIL import Image, ImageDraw, ImageChops, ImageFilter
 from reportlab.pdfgen import canvas as rl_canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
+from reportlab.lib.boxstuff import aspectRatioFix
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
+
+try:
+    import numpy as np  # optional
+except Exception:
+    np = None
+
+try:
+    import numba as nb  # optional; compiles the flowfield and Voronoi loops
+except Exception:
+    nb = None
 
 import curses
 
@@ -59,6 +73,19 @@ PALETTES = ["random","highcontrast","subtle","earthtones","psychedelic","neon","
 BLEND_MODES = ["source-over","multiply","screen","difference","lighter","overlay","exclusion"]
 
 
+# Single-hue-parameter palettes as tables over rng.random(); still one draw per
+# colour, so the rng sequence is unchanged. Built on first use.
+HUE_LUT_SIZE = 4096
+_HUE_SPANS = {"psychedelic": (0.0, 360.0, 1.0, 0.5), "neon": (180.0, 180.0, 1.0, 0.6), "random": (0.0, 360.0, 0.8, 0.6)}
+_HUE_LUTS: Dict[str, List[Tuple[int,int,int]]] = {}
+
+def _hue_lut(palette: str) -> List[Tuple[int,int,int]]:
+    lut = _HUE_LUTS.get(palette)
+    if lut is None:
+        h0, span, s, l = _HUE_SPANS[palette]
+        lut = _HUE_LUTS[palette] = [hsl_to_rgb(h0 + (i+0.5)/HUE_LUT_SIZE*span, s, l) for i in range(HUE_LUT_SIZE)]
+    return lut
+
 def pick_color(rng: random.Random, is_color: bool, palette: str, alpha: int = 255) -> Tuple[int,int,int,int]:
     if not is_color:
         g = rng.randrange(256)
@@ -73,47 +100,56 @@ def pick_color(rng: random.Random, is_color: bool, palette: str, alpha: int = 25
         sat = (30 + rng.random()*50)/100.0
         lig = (20 + rng.random()*45)/100.0
         r,g,b = hsl_to_rgb(h,sat,lig); return (r,g,b,alpha)
-    if p == "psychedelic":
-        r,g,b = hsl_to_rgb(rng.random()*360,1.0,0.5); return (r,g,b,alpha)
-    if p == "neon":
-        r,g,b = hsl_to_rgb(180+rng.random()*180,1.0,0.6); return (r,g,b,alpha)
     if p == "thermal":
         t=rng.random()
         return (255,0,255,alpha) if t<0.33 else (255,255,255,alpha) if t<0.66 else (0,0,255,alpha)
-    r,g,b = hsl_to_rgb(rng.random()*360,0.8,0.6); return (r,g,b,alpha)
+    if p not in _HUE_SPANS:
+        p = "random"
+    return _hue_lut(p)[int(rng.random()*HUE_LUT_SIZE)] + (alpha,)
+
 
+_LOW_HALF = [255 if p < 128 else 0 for p in range(256)]
 
-def _blend_overlay_exclusion_pure(base: Image.Image, top: Image.Image, mode: str) -> Image.Image:
+def _blend_overlay_exclusion_chops(base: Image.Image, top: Image.Image, mode: str) -> Image.Image:
+    # Both modes rebuilt from Pillow's C ops, per channel:
+    #   overlay   = 2*multiply where base<128, else 2*screen-255
+    #   exclusion = screen - multiply  (b+t - 2bt/255)
     b = base.convert("RGBA")
     t = top.convert("RGBA")
-    W, H = b.size
-    bpx = b.tobytes()
-    tpx = t.tobytes()
-    out = bytearray(len(bpx))
-
-    def overlay(bc, tc):
-        return int((2*bc*tc/255) if bc < 128 else (255 - 2*(255-bc)*(255-tc)/255))
-
-    def exclusion(bc, tc):
-        return int(bc + tc - 2*bc*tc/255)
-
-    f = overlay if mode == "overlay" else exclusion
-
-    for i in range(0, len(bpx), 4):
-        br, bg, bb, ba = bpx[i], bpx[i+1], bpx[i+2], bpx[i+3]
-        tr, tg, tb, ta = tpx[i], tpx[i+1], tpx[i+2], tpx[i+3]
-        rr = _clamp255(f(br, tr))
-        gg = _clamp255(f(bg, tg))
-        bb2 = _clamp255(f(bb, tb))
-        a = ta / 255.0
-        out[i]   = _clamp255(rr * a + br * (1-a))
-        out[i+1] = _clamp255(gg * a + bg * (1-a))
-        out[i+2] = _clamp255(bb2 * a + bb * (1-a))
-        out[i+3] = _clamp255(255*(a + (ba/255.0)*(1-a)))
-    return Image.frombytes("RGBA", (W,H), bytes(out))
-
-
-def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float) -> Image.Image:
+    rgbb = b.convert("RGB")
+    rgbt = t.convert("RGB")
+    mul = ImageChops.multiply(rgbb, rgbt)
+    scr = ImageChops.screen(rgbb, rgbt)
+    if mode == "overlay":
+        low = ImageChops.add(mul, mul)
+        high = ImageChops.add(scr, scr, 1.0, -255)
+        bands = [Image.composite(lo, hi, bb.point(_LOW_HALF))
+                 for lo, hi, bb in zip(low.split(), high.split(), rgbb.split())]
+    else:
+        bands = list(ImageChops.subtract(scr, mul).split())
+    mixed = Image.merge("RGBA", bands + [t.getchannel("A")])
+    return Image.alpha_composite(b, mixed)
+
+
+def _blend_overlay_exclusion_np(base: Image.Image, top: Image.Image, mode: str) -> Image.Image:
+    # Exact formulas (int() truncation, straight-alpha composite), one array expression per step
+    b = np.asarray(base.convert("RGBA"), dtype=np.uint8)
+    t = np.asarray(top.convert("RGBA"), dtype=np.uint8)
+    b_rgb = b[..., :3].astype(np.float64)
+    t_rgb = t[..., :3].astype(np.float64)
+    if mode == "overlay":
+        mixed = np.where(b_rgb < 128, 2*b_rgb*t_rgb/255, 255 - 2*(255-b_rgb)*(255-t_rgb)/255)
+    else:
+        mixed = b_rgb + t_rgb - 2*b_rgb*t_rgb/255
+    np.floor(np.clip(mixed, 0, 255, out=mixed), out=mixed)
+    ta = t[..., 3:4].astype(np.float64) / 255
+    out = np.empty_like(b)
+    out[..., :3] = np.clip(mixed*ta + b_rgb*(1-ta), 0, 255)
+    out[..., 3:4] = np.clip(255*(ta + b[..., 3:4]/255.0*(1-ta)), 0, 255)
+    return Image.fromarray(out, "RGBA")
+
+
+def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float, opaque_base: bool = False) -> Image.Image:
     if alpha <= 0:
         return base
     if base.mode != "RGBA":
@@ -141,22 +177,16 @@ def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float) ->
         else:
             mixed = ImageChops.lighter(rgbb, rgbt)
         mixed = mixed.convert("RGBA")
+        if opaque_base:
+            # over an opaque base the composite is a plain lerp by top's alpha
+            return Image.composite(mixed, base, top.getchannel("A"))
         mixed.putalpha(top.split()[-1])
         return Image.alpha_composite(base, mixed)
 
     if m in ("overlay","exclusion"):
-        # For performance, do these at reduced resolution if the image is big.
-        W,H = base.size
-        work = 0.5 if (W*H) > 800_000 else 1.0
-        if work != 1.0:
-            w2,h2 = int(W*work), int(H*work)
-            b2 = base.resize((w2,h2), Image.BILINEAR)
-            t2 = top.resize((w2,h2), Image.BILINEAR)
-            out2 = _blend_overlay_exclusion_pure(b2, t2, m)
-            out = out2.resize((W,H), Image.BILINEAR)
-            out.putalpha(Image.alpha_composite(base, top).split()[-1])
-            return out
-        return _blend_overlay_exclusion_pure(base, top, m)
+        if np is not None:
+            return _blend_overlay_exclusion_np(base, top, m)
+        return _blend_overlay_exclusion_chops(base, top, m)
 
     return Image.alpha_composite(base, top)
 
@@ -166,10 +196,13 @@ def blend_layer(base: Image.Image, top: Image.Image, mode: str, alpha: float) ->
 def pat_lines(rng,W,H,is_color,pal,comp):
     img=Image.new("RGBA",(W,H),(0,0,0,0)); d=ImageDraw.Draw(img)
     count=int(60+comp*220)
+    # segments are disjoint and overlap in draw order, so they stay one call
+    # each; only the lookups are hoisted
+    rnd=rng.random; line=d.line; wspan=1+6*comp
     for _ in range(count):
-        d.line((rng.random()*W,rng.random()*H,rng.random()*W,rng.random()*H),
-               fill=pick_color(rng,is_color,pal,255),
-               width=max(1,int(1+rng.random()*(1+6*comp))))
+        line((rnd()*W,rnd()*H,rnd()*W,rnd()*H),
+             fill=pick_color(rng,is_color,pal,255),
+             width=max(1,int(1+rnd()*wspan)))
     return img
 
 def pat_circles(rng,W,H,is_color,pal,comp):
@@ -186,22 +219,35 @@ def pat_circles(rng,W,H,is_color,pal,comp):
 def pat_grid(rng,W,H,is_color,pal,comp):
     img=Image.new("RGBA",(W,H),(0,0,0,0)); d=ImageDraw.Draw(img)
     gs=int(10+comp*34)
-    for i in range(gs):
-        for j in range(gs):
-            x=(i/(gs-1))*W+(rng.random()*18-9)
-            y=(j/(gs-1))*H+(rng.random()*18-9)
-            rr=2+rng.random()*(2+10*comp)
-            d.ellipse((x-rr,y-rr,x+rr,y+rr), fill=pick_color(rng,is_color,pal,255))
+    # ellipse() on a tiny disc is cheaper than pasting a stamp through a mask,
+    # so each dot stays one call; the per-row/column terms are hoisted
+    rnd=rng.random; ellipse=d.ellipse; rspan=2+10*comp
+    cols=[(i/(gs-1))*W for i in range(gs)]
+    rows=[(j/(gs-1))*H for j in range(gs)]
+    for x0 in cols:
+        for y0 in rows:
+            x=x0+(rnd()*18-9)
+            y=y0+(rnd()*18-9)
+            rr=2+rnd()*rspan
+            ellipse((x-rr,y-rr,x+rr,y+rr), fill=pick_color(rng,is_color,pal,255))
     return img
 
 def pat_moire(rng,W,H,is_color,pal,comp):
     img=Image.new("RGBA",(W,H),(0,0,0,0)); d=ImageDraw.Draw(img)
     cx=W/2+(rng.random()*90-45); cy=H/2+(rng.random()*90-45)
     step=3+(1-comp)*9
+    # radii (accumulated as before) and colours up front; each ring is a
+    # 1px outline in its own colour, so the ellipse calls themselves stay
+    limit=min(W,H)/2
+    radii=[]
     r=6.0
-    while r<min(W,H)/2:
-        d.ellipse((cx-r,cy-r,cx+r,cy+r), outline=pick_color(rng,is_color,pal,255), width=1)
+    while r<limit:
+        radii.append(r)
         r+=step
+    colors=[pick_color(rng,is_color,pal,255) for _ in radii]
+    ellipse=d.ellipse
+    for r,col in zip(radii,colors):
+        ellipse((cx-r,cy-r,cx+r,cy+r), outline=col, width=1)
     return img
 
 def pat_dazzle(rng,W,H,is_color,pal,comp):
@@ -228,12 +274,16 @@ def pat_zebra(rng,W,H,is_color,pal,comp):
     return img
 
 def pat_checker(rng,W,H,is_color,pal,comp):
-    img=Image.new("RGBA",(W,H),(0,0,0,0)); d=ImageDraw.Draw(img)
     size=int(18+(1-comp)*46)
-    for y in range(0,H,size):
-        for x in range(0,W,size):
-            gray=150 if ((x//size+y//size)%2==0) else 95
-            d.rectangle((x,y,x+size,y+size), fill=(gray,gray,gray,255))
+    # the board as bytes: two band rows (starting light / dark) repeated down
+    # the image, instead of one rectangle call per cell
+    light, dark = bytes((150,150,150,255))*size, bytes((95,95,95,255))*size
+    cells=(W+size-1)//size+1
+    row_a=((light+dark)*(cells//2+1))[:W*4]
+    row_b=((dark+light)*(cells//2+1))[:W*4]
+    bands=(row_a*size, row_b*size)
+    img=Image.frombytes("RGBA",(W,H), b"".join(bands[k%2] for k in range((H+size-1)//size))[:W*H*4])
+    d=ImageDraw.Draw(img)
     d.rectangle((size*2,size,W-size*2,H-size), fill=(0,0,0,int(40+comp*150)))
     d.ellipse((W/2-90,H-70,W/2+90,H-20), fill=pick_color(rng,is_color,pal,255))
     return img
@@ -252,21 +302,31 @@ def pat_glitchgrid(rng,W,H,is_color,pal,comp):
     return img
 
 def pat_noise(rng,W,H,is_color,pal,comp):
-    # pure python small noise then upscale (fast)
+    # small noise then upscale (fast); grey noise stays single-band until the
+    # end, and the resize runs before the RGBA conversion (opaque either way)
     sw, sh = max(320, W//3), max(240, H//3)
-    buf = bytearray(sw*sh*3)
-    for i in range(0, len(buf), 3):
-        base = rng.randrange(256)
+    if np is not None:
+        # same distribution, drawn in bulk from a generator seeded off rng
+        gen = np.random.default_rng(rng.randrange(1, 2_000_000_000))
+        base = gen.integers(0, 256, (sh, sw), dtype=np.uint8)
         if is_color:
+            r = base + gen.integers(0, 50, (sh, sw), dtype=np.uint8)  # wraps mod 256
+            b = base + gen.integers(0, 50, (sh, sw), dtype=np.uint8)
+            img = Image.fromarray(np.dstack([r, base, b]), "RGB")
+        else:
+            img = Image.fromarray(base, "L")
+    elif not is_color:
+        rnd = rng.randrange
+        img = Image.frombytes("L", (sw,sh), bytes([rnd(256) for _ in range(sw*sh)]))
+    else:
+        buf = bytearray(sw*sh*3)
+        for i in range(0, len(buf), 3):
+            base = rng.randrange(256)
             buf[i] = (base + rng.randrange(0, 50)) & 255
             buf[i+1] = base
             buf[i+2] = (base + rng.randrange(0, 50)) & 255
-        else:
-            buf[i] = buf[i+1] = buf[i+2] = base
-    img = Image.frombytes("RGB", (sw,sh), bytes(buf)).convert("RGBA")
-    img = img.resize((W,H), Image.BICUBIC)
-    img.putalpha(255)
-    return img
+        img = Image.frombytes("RGB", (sw,sh), bytes(buf))
+    return img.resize((W,H), Image.BILINEAR).convert("RGBA")
 
 def pat_spirals(rng,W,H,is_color,pal,comp):
     img=Image.new("RGBA",(W,H),(0,0,0,0)); d=ImageDraw.Draw(img)
@@ -285,11 +345,37 @@ def pat_spirals(rng,W,H,is_color,pal,comp):
             t+=step
         col=pick_color(rng,is_color,pal,alpha=220)
         width=max(1,int(1+rng.random()*(1+3*comp)))
-        for i in range(len(pts)-1):
-            if i%2==0:
-                d.line((pts[i][0],pts[i][1],pts[i+1][0],pts[i+1][1]), fill=col, width=width)
+        # dashed: every other segment, so no single polyline; skip the gaps instead of testing them
+        for i in range(0, len(pts)-1, 2):
+            d.line(pts[i]+pts[i+1], fill=col, width=width)
     return img
 
+if np is not None and nb is not None:
+    @nb.njit(cache=True)
+    def _advect(starts, steps, W, H, k1, k2, phase1, phase2, step_len):
+        # same field and stopping rule as vec() below; returns every particle's
+        # points and how many of them it drew before leaving the canvas
+        n = starts.shape[0]
+        path = np.empty((n, steps+1, 2))
+        n_pts = np.empty(n, dtype=np.intp)
+        for i in range(n):
+            x = starts[i, 0]; y = starts[i, 1]
+            path[i, 0, 0] = x; path[i, 0, 1] = y
+            k = 1
+            for _s in range(steps):
+                ang = math.sin(x*k1+phase1)+math.cos(y*k2+phase2)
+                ang2 = math.sin((x+y)*k1*0.7+phase2)
+                a = (ang+0.7*ang2)*math.pi
+                x = x+math.cos(a)*step_len; y = y+math.sin(a)*step_len
+                path[i, k, 0] = x; path[i, k, 1] = y
+                k += 1
+                if x<0 or x>=W or y<0 or y>=H:
+                    break
+            n_pts[i] = k
+        return path, n_pts
+else:
+    _advect = None
+
 def pat_flowfield(rng,W,H,is_color,pal,comp):
     img=Image.new("RGBA",(W,H),(0,0,0,0)); d=ImageDraw.Draw(img)
     n_particles=int(220+comp*900)
@@ -304,38 +390,86 @@ def pat_flowfield(rng,W,H,is_color,pal,comp):
         a=(ang+0.7*ang2)*math.pi
         return math.cos(a), math.sin(a)
 
+    if _advect is not None:
+        # rng is drawn in the same order as the loop below, then all the
+        # stepping runs compiled and each particle is drawn as one polyline
+        starts=[]; cols=[]
+        for _ in range(n_particles):
+            starts.append((rng.random()*W, rng.random()*H))
+            cols.append(pick_color(rng,is_color,pal,alpha=int(70+140*comp)))
+        path,n_pts=_advect(np.array(starts), steps, W, H, k1, k2, phase1, phase2, step_len)
+        for i in range(n_particles):
+            d.line(path[i,:n_pts[i]].ravel().tolist(), fill=cols[i], width=1)
+        return img
+
     for _ in range(n_particles):
         x=rng.random()*W; y=rng.random()*H
         col=pick_color(rng,is_color,pal,alpha=int(70+140*comp))
+        traj=[x,y]
         for _s in range(steps):
             vx,vy=vec(x,y)
-            x2=x+vx*step_len; y2=y+vy*step_len
-            d.line((x,y,x2,y2), fill=col, width=1)
-            x,y=x2,y2
+            x+=vx*step_len; y+=vy*step_len
+            traj+=(x,y)
             if x<0 or x>=W or y<0 or y>=H:
                 break
+        d.line(traj, fill=col, width=1)
     return img
 
+if np is not None and nb is not None:
+    @nb.njit(cache=True)
+    def _voronoi_assign(pxs, pys, sh, sw):
+        # nearest site per pixel; strict < keeps the lowest index on ties.
+        # Serial on purpose: the export pool forks, and a parent that has already
+        # started numba's OpenMP/TBB threads (e.g. via preview) breaks its workers
+        out = np.empty((sh, sw), dtype=np.intp)
+        for y in range(sh):
+            for x in range(sw):
+                best_i = 0; best_d = 1e18
+                for i in range(pxs.shape[0]):
+                    dx = x-pxs[i]; dy = y-pys[i]
+                    dd = dx*dx+dy*dy
+                    if dd < best_d:
+                        best_d = dd; best_i = i
+                out[y, x] = best_i
+        return out
+else:
+    _voronoi_assign = None
+
 def pat_voronoi(rng,W,H,is_color,pal,comp):
     # Approx Voronoi: compute on low-res grid then upscale
     n=12+int(comp*30)
     sw, sh = max(220, W//3), max(160, H//3)
     points=[(rng.random()*sw, rng.random()*sh) for _ in range(n)]
     colors=[pick_color(rng,is_color,pal,255) for _ in range(n)]
-    img=Image.new("RGBA",(sw,sh),(0,0,0,0))
-    px=img.load()
-    for y in range(sh):
-        for x in range(sw):
-            best_i=0; best_d=1e18
-            for i,(pxi,pyi) in enumerate(points):
-                dx=x-pxi; dy=y-pyi
-                dd=dx*dx+dy*dy
-                if dd<best_d:
-                    best_d=dd; best_i=i
-            px[x,y]=colors[best_i]
+    if _voronoi_assign is not None:
+        pts=np.array(points)
+        best_i=_voronoi_assign(pts[:,0], pts[:,1], sh, sw)
+        img=Image.fromarray(np.array(colors, dtype=np.uint8)[best_i], "RGBA")
+    elif np is not None:
+        # running nearest site over the whole grid, one site per pass;
+        # strict < keeps the lowest index on ties like the loop below
+        xs=np.arange(sw, dtype=np.float64); ys=np.arange(sh, dtype=np.float64)
+        best_d=np.full((sh,sw), np.inf); best_i=np.zeros((sh,sw), dtype=np.intp)
+        for i,(pxi,pyi) in enumerate(points):
+            dd=((xs-pxi)**2)[None,:]+((ys-pyi)**2)[:,None]
+            closer=dd<best_d
+            best_d[closer]=dd[closer]; best_i[closer]=i
+        img=Image.fromarray(np.array(colors, dtype=np.uint8)[best_i], "RGBA")
+    else:
+        img=Image.new("RGBA",(sw,sh),(0,0,0,0))
+        px=img.load()
+        for y in range(sh):
+            for x in range(sw):
+                best_i=0; best_d=1e18
+                for i,(pxi,pyi) in enumerate(points):
+                    dx=x-pxi; dy=y-pyi
+                    dd=dx*dx+dy*dy
+                    if dd<best_d:
+                        best_d=dd; best_i=i
+                px[x,y]=colors[best_i]
     # edges
     img=img.filter(ImageFilter.FIND_EDGES)
-    img=img.resize((W,H), Image.BICUBIC)
+    img=img.resize((W,H), Image.BILINEAR)
     img.putalpha(255)
     return img
 
@@ -354,6 +488,10 @@ PATTERNS = {
     "flowfield": pat_flowfield,
 }
 
+# layers made of flat blocks or pixel noise; a fast-mode design built only from
+# these is upscaled with NEAREST, since smoothing adds nothing to them
+HARD_EDGED = {"dazzle","zebra","checker","glitchgrid","noise","voronoi"}
+
 @dataclass
 class EngineConfig:
     width: int = 1024
@@ -368,6 +506,7 @@ class EngineConfig:
     complexity: float = 0.78
     fast_mode: bool = True
     jpeg_quality: int = 88
+    jpeg_optimize: bool = False
     save_png_set: bool = False
     combined_pdf: bool = False
     fixed_pattern_order: bool = False
@@ -375,6 +514,21 @@ class EngineConfig:
 class PatternEngine:
     def __init__(self, patterns: Dict[str, callable]):
         self.patterns = patterns
+        # background noise per (seed, size, complexity); the colour and B/W
+        # renders of a seed draw the same texture, so it is built only once
+        self._textures: Dict[tuple, Image.Image] = {}
+
+    def _texture(self, seed, w, h, comp):
+        key=(seed, w, h, comp)
+        tex=self._textures.pop(key, None)
+        if tex is None:
+            if len(self._textures) >= 16:
+                # pop, not del: export threads may evict concurrently
+                self._textures.pop(next(iter(self._textures)), None)
+            tex=pat_noise(random.Random(seed ^ 0x1234ABCD), w, h, False, "subtle", comp)
+        # re-insert so the dict stays in least-recently-used order
+        self._textures[key]=tex
+        return tex
 
     def _pick_palette(self, rng, palette_mode, is_color):
         if not is_color:
@@ -408,8 +562,7 @@ class PatternEngine:
         opacity=float(cfg.opacity); comp=float(cfg.complexity)
 
         base=Image.new("RGBA",(w2,h2),(0,0,0,255))
-        tex_rng=random.Random(seed ^ 0x1234ABCD)
-        base=Image.alpha_composite(base, pat_noise(tex_rng, w2,h2, False, "subtle", min(0.35, comp)))
+        base=Image.alpha_composite(base, self._texture(seed, w2, h2, min(0.35, comp)))
 
         pats=[p for p in selected_patterns if p in self.patterns] or ["lines"]
         if cfg.fixed_pattern_order:
@@ -423,10 +576,12 @@ class PatternEngine:
             layer=self.patterns[name](layer_rng,w2,h2,is_color,pal,comp)
             a=max(0.18, opacity*(1-idx*0.22))
             mode="source-over" if idx==0 else blend
-            base=blend_layer(base, layer, mode, a)
+            # base starts opaque and every blend keeps it so
+            base=blend_layer(base, layer, mode, a, opaque_base=True)
 
         if scale!=1.0:
-            base=base.resize((W,H), Image.BILINEAR)
+            resample=Image.NEAREST if HARD_EDGED.issuperset(chosen) else Image.BILINEAR
+            base=base.resize((W,H), resample)
 
         # marks
         d=ImageDraw.Draw(base)
@@ -479,84 +634,155 @@ class PatternEngine:
             c.setFont("Helvetica",9)
             c.drawRightString(page_w-margin, page_h-header_h+11, f"Generated {today} • run seed {base_seed}")
 
-        c_color = rl_canvas.Canvas(color_pdf, pagesize=A4)
-        c_bw = rl_canvas.Canvas(bw_pdf, pagesize=A4)
-        c_comb = rl_canvas.Canvas(combined_pdf, pagesize=A4) if combined_pdf else None
-
-        color_indices=[i for i,f in enumerate(flags) if f]
-        bw_indices=[i for i,f in enumerate(flags) if not f]
-
-        def draw_two_per_page(c, indices, kind_label):
-            pages = math.ceil(len(indices)/2) if indices else 1
-            for p in range(pages):
-                if stop_flag and stop_flag(): break
-                header(c)
-                for pos in range(2):
-                    k=p*2+pos
-                    if k>=len(indices): break
-                    idx=indices[k]
-                    is_color=(kind_label=="COLOR")
-                    img, meta = self.render_design(seeds[idx], cfg, is_color, selected_patterns)
-
-                    if cfg.save_png_set:
-                        fn=f"design_{(idx+1):03d}_seed_{meta['seed']}.png"
-                        if is_color:
-                            img.save(os.path.join(png_color_dir, fn))
-                        else:
-                            img.convert("L").convert("RGB").save(os.path.join(png_bw_dir, fn))
-
-                    buf=io.BytesIO()
-                    img.convert("RGB").save(buf, format="JPEG", quality=int(cfg.jpeg_quality), optimize=True)
-                    buf.seek(0)
+        # Designs are rendered and JPEG-encoded in worker processes and come back
+        # in submission order; only page assembly happens here
+        n_jobs=cfg.count*(2 if cfg.combined_pdf else 1)
+        workers=min(os.cpu_count() or 1, n_jobs)
+        pool=None
+        if workers>1:
+            try:
+                pool=ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                                         initargs=(self.patterns, cfg, selected_patterns))
+            except (OSError, NotImplementedError, ImportError):
+                pool=None
+        in_process = pool is None
+        if in_process:
+            # no usable multiprocessing (or a single core): background threads;
+            # with two, one design's JPEG encode (GIL released) overlaps the next render
+            pool=ThreadPoolExecutor(max_workers=min(2, workers))
+
+        def render(jobs):
+            if in_process:
+                return pool.map(partial(_render_job, self, cfg, selected_patterns), jobs)
+            return pool.map(_render_job_in_worker, jobs, chunksize=max(1, len(jobs)//(workers*4)))
+
+        def png_path(kind_dir, idx):
+            if not cfg.save_png_set:
+                return None
+            return os.path.join(kind_dir, f"design_{(idx+1):03d}_seed_{seeds[idx]}.png")
+
+        try:
+            c_color = rl_canvas.Canvas(color_pdf, pagesize=A4)
+            c_bw = rl_canvas.Canvas(bw_pdf, pagesize=A4)
+            c_comb = rl_canvas.Canvas(combined_pdf, pagesize=A4) if combined_pdf else None
+
+            color_indices=[i for i,f in enumerate(flags) if f]
+            bw_indices=[i for i,f in enumerate(flags) if not f]
+
+            # queue every render up front; each PDF consumes its own ordered stream
+            color_results=render([(seeds[i], True, png_path(png_color_dir, i)) for i in color_indices])
+            bw_results=render([(seeds[i], False, png_path(png_bw_dir, i)) for i in bw_indices])
+            # each design's own variant is already encoded for its colour/B&W PDF;
+            # those bytes are kept for the combined page, which then only needs
+            # the other variant rendered. Entries are dropped as they are used.
+            encoded={} if c_comb else None
+            comb_results=render([(seeds[i], not flags[i], None) for i in range(cfg.count)]) if c_comb else None
+
+            def draw_two_per_page(c, indices, results, kind_label):
+                pages = math.ceil(len(indices)/2) if indices else 1
+                for p in range(pages):
+                    if stop_flag and stop_flag(): break
+                    header(c)
+                    for pos in range(2):
+                        k=p*2+pos
+                        if k>=len(indices): break
+                        idx=indices[k]
+                        jpeg, meta = next(results)
+                        if encoded is not None:
+                            encoded[idx]=jpeg
+                        x=margin
+                        y=margin+footer_h+(1-pos)*(slot_h+gap)
+                        c.setFillColorRGB(1,1,1)
+                        c.rect(x-2,y-2,slot_w+4,slot_h+4,fill=1,stroke=0)
+                        _draw_jpeg(c, f"design{idx}", jpeg, x, y, slot_w, slot_h)
+                        c.setFillColorRGB(0,0,0)
+                        c.rect(x,y,slot_w,18,fill=1,stroke=0)
+                        c.setFillColorRGB(1,1,1)
+                        c.setFont("Helvetica",8.6)
+                        label=f"{kind_label} • design {(idx+1):03d} • seed {meta['seed']} • {', '.join(meta['patterns'])} • blend {meta['blend']} • palette {meta['palette']}"
+                        c.drawString(x+6,y+5,label[:160])
+
+                        if progress_cb: progress_cb()
+                    c.showPage()
+
+            draw_two_per_page(c_color, color_indices, color_results, "COLOR")
+            c_color.save()
+
+            draw_two_per_page(c_bw, bw_indices, bw_results, "B&W")
+            c_bw.save()
+
+            if c_comb:
+                pages = cfg.count
+                for idx in range(cfg.count):
+                    if stop_flag and stop_flag(): break
+                    header(c_comb)
+                    own=encoded.pop(idx)
+                    other,_ = next(comb_results)
+                    jpeg_c,jpeg_b = (own,other) if flags[idx] else (other,own)
+
                     x=margin
-                    y=margin+footer_h+(1-pos)*(slot_h+gap)
-                    c.setFillColorRGB(1,1,1)
-                    c.rect(x-2,y-2,slot_w+4,slot_h+4,fill=1,stroke=0)
-                    c.drawImage(ImageReader(buf), x, y, width=slot_w, height=slot_h, preserveAspectRatio=True, anchor='c')
-                    c.setFillColorRGB(0,0,0)
-                    c.rect(x,y,slot_w,18,fill=1,stroke=0)
-                    c.setFillColorRGB(1,1,1)
-                    c.setFont("Helvetica",8.6)
-                    label=f"{kind_label} • design {(idx+1):03d} • seed {meta['seed']} • {', '.join(meta['patterns'])} • blend {meta['blend']} • palette {meta['palette']}"
-                    c.drawString(x+6,y+5,label[:160])
+                    y_top=margin+footer_h+slot_h+gap
+                    _draw_jpeg(c_comb, f"design{idx}c", jpeg_c, x, y_top, slot_w, slot_h)
+
+                    y_bot=margin+footer_h
+                    _draw_jpeg(c_comb, f"design{idx}b", jpeg_b, x, y_bot, slot_w, slot_h)
 
                     if progress_cb: progress_cb()
-                c.showPage()
-
-        draw_two_per_page(c_color, color_indices, "COLOR")
-        c_color.save()
-
-        draw_two_per_page(c_bw, bw_indices, "B&W")
-        c_bw.save()
-
-        if c_comb:
-            pages = cfg.count
-            for idx in range(cfg.count):
-                if stop_flag and stop_flag(): break
-                header(c_comb)
-                img_c,_ = self.render_design(seeds[idx], cfg, True, selected_patterns)
-                img_b,_ = self.render_design(seeds[idx], cfg, False, selected_patterns)
-
-                buf=io.BytesIO()
-                img_c.convert("RGB").save(buf, format="JPEG", quality=int(cfg.jpeg_quality), optimize=True)
-                buf.seek(0)
-                x=margin
-                y_top=margin+footer_h+slot_h+gap
-                c_comb.drawImage(ImageReader(buf), x, y_top, width=slot_w, height=slot_h, preserveAspectRatio=True, anchor='c')
-
-                buf2=io.BytesIO()
-                img_b.convert("RGB").save(buf2, format="JPEG", quality=int(cfg.jpeg_quality), optimize=True)
-                buf2.seek(0)
-                y_bot=margin+footer_h
-                c_comb.drawImage(ImageReader(buf2), x, y_bot, width=slot_w, height=slot_h, preserveAspectRatio=True, anchor='c')
-
-                if progress_cb: progress_cb()
-                c_comb.showPage()
-            c_comb.save()
+                    c_comb.showPage()
+                c_comb.save()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
         return {"color_pdf":color_pdf,"bw_pdf":bw_pdf,"combined_pdf":combined_pdf or "","run_seed":str(base_seed)}
 
 
+def _render_job(engine, cfg, selected_patterns, job):
+    # (seed, is_color, png_path) -> (jpeg bytes, meta); also writes the PNG-set copy
+    seed, is_color, png_path = job
+    img, meta = engine.render_design(seed, cfg, is_color, selected_patterns)
+    if png_path:
+        (img if is_color else img.convert("L").convert("RGB")).save(png_path)
+    return _jpeg_bytes(img, int(cfg.jpeg_quality), cfg.jpeg_optimize), meta
+
+def _jpeg_bytes(img, quality, optimize=False):
+    # 4:2:0 always; the extra Huffman pass and progressive scans only when the
+    # smallest files were asked for (about 2x the encode time for ~5-7% less)
+    buf=io.BytesIO()
+    img.convert("RGB").save(buf, format="JPEG", quality=quality, subsampling=2, optimize=optimize, progressive=optimize)
+    return buf.getvalue()
+
+def _draw_jpeg(c, name, jpeg, x, y, width, height):
+    # drawImage(..., preserveAspectRatio=True, anchor='c') for encoded JPEG bytes:
+    # the stream is embedded verbatim (DCTDecode) instead of an ImageReader
+    # decoding the whole image again just to hash it
+    img = PDFImageXObject(name)
+    if not img.loadImageFromJPEG(io.BytesIO(jpeg)):
+        c.drawImage(ImageReader(io.BytesIO(jpeg)), x, y, width=width, height=height, preserveAspectRatio=True, anchor='c')
+        return
+    # and kept binary: ASCII85 would re-encode every byte in Python and grow it by 25%
+    img.streamContent = jpeg
+    img._filters = ('DCTDecode',)
+    c._currentPageHasImages = 1
+    c._setXObjects(img)
+    c._doc.addForm(name, img)
+    x, y, width, height, _ = aspectRatioFix(True, 'c', x, y, width, height, img.width, img.height)
+    c.saveState()
+    c.translate(x, y)
+    c.scale(width, height)
+    c.doForm(name)
+    c.restoreState()
+
+# set once per worker process by the export pool's initializer
+_worker_job_args = None
+
+def _init_render_worker(patterns, cfg, selected_patterns):
+    global _worker_job_args
+    _worker_job_args = (PatternEngine(patterns), cfg, selected_patterns)
+
+def _render_job_in_worker(job):
+    return _render_job(*_worker_job_args, job)
+
+
 # ---------------- TUI ----------------
 
 class TUI:
@@ -613,7 +839,7 @@ class TUI:
 
         self.stdscr.addstr(2, 0, f"Output: {self.out_dir}"[:w-1])
         self.stdscr.addstr(3, 0, f"Seed:{self.cfg.seed}  Count:{self.cfg.count}  Size:{self.cfg.width}x{self.cfg.height}  Layers:{self.cfg.layers_min}-{self.cfg.layers_max}"[:w-1])
-        self.stdscr.addstr(4, 0, f"Palette:{self.cfg.palette_mode}  Blend:{self.cfg.blend_mode}  Fast:{int(self.cfg.fast_mode)}  PNG:{int(self.cfg.save_png_set)}  Combined:{int(self.cfg.combined_pdf)}  FixedOrder:{int(self.cfg.fixed_pattern_order)}"[:w-1])
+        self.stdscr.addstr(4, 0, f"Palette:{self.cfg.palette_mode}  Blend:{self.cfg.blend_mode}  Fast:{int(self.cfg.fast_mode)}  PNG:{int(self.cfg.save_png_set)}  Combined:{int(self.cfg.combined_pdf)}  FixedOrder:{int(self.cfg.fixed_pattern_order)}  SmallJPEG:{int(self.cfg.jpeg_optimize)}"[:w-1])
 
         self.stdscr.addstr(6, 0, "Patterns (toggle with SPACE):", curses.A_UNDERLINE)
         box_top = 7
@@ -654,6 +880,7 @@ class TUI:
             self.cfg.opacity = float(self.prompt("Opacity 0.1-1.0", self.cfg.opacity))
             self.cfg.complexity = float(self.prompt("Complexity 0-1", self.cfg.complexity))
             self.cfg.jpeg_quality = int(self.prompt("JPEG quality 50-95", self.cfg.jpeg_quality))
+            self.cfg.jpeg_optimize = bool(int(self.prompt("Smallest JPEGs (slower) 1/0", int(self.cfg.jpeg_optimize))))
             self.cfg.fast_mode = bool(int(self.prompt("Fast mode 1/0", int(self.cfg.fast_mode))))
             self.cfg.save_png_set = bool(int(self.prompt("Save PNG set 1/0", int(self.cfg.save_png_set))))
             self.cfg.combined_pdf = bool(int(self.prompt("Combined PDF 1/0", int(self.cfg.combined_pdf))))